@@ -1,48 +1,61 @@
 #!/usr/bin/env python3
 """Combine batch CSV files into raw-data.csv."""
-import csv
 from pathlib import Path
 
+import pandas as pd
+
 OUTPUT_DIR = Path(__file__).parent / "output"
+# Rows per read_csv chunk; bounds memory regardless of batch size
+CHUNK_ROWS = 100_000
 
 def main():
-    all_rows = []
-    header = None
-
+    batch_files = []
     for i in range(1, 6):
         batch_file = OUTPUT_DIR / f"batch-{i}.csv"
         if not batch_file.exists():
             print(f"WARNING: {batch_file} not found, skipping")
             continue
+        batch_files.append(batch_file)
 
-        with open(batch_file) as f:
-            reader = csv.DictReader(f)
-            if header is None:
-                header = reader.fieldnames
-            rows = list(reader)
-            all_rows.extend(rows)
-            print(f"batch-{i}.csv: {len(rows)} rows")
-
-    if not header or not all_rows:
+    if not batch_files:
         print("ERROR: No data found")
         return
 
     output_path = OUTPUT_DIR / "raw-data.csv"
-    with open(output_path, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=header)
-        writer.writeheader()
-        writer.writerows(all_rows)
-
-    # Stats
-    models = set(r["model_id"] for r in all_rows)
+    columns = None
+    first = True
+    total_rows = 0
+    models = set()
     values = set()
     vignettes = set()
-    for r in all_rows:
-        values.add(r["value_a"])
-        values.add(r["value_b"])
-        vignettes.add(r["vignette_name"])
 
-    print(f"\nCombined: {len(all_rows)} rows -> {output_path}")
+    # Stream each batch through in chunks, appending to the output and
+    # collecting stats as we go. Every column is read as text so values
+    # round-trip unchanged.
+    for batch_file in batch_files:
+        rows = 0
+        chunks = pd.read_csv(batch_file, dtype=str, keep_default_na=False, chunksize=CHUNK_ROWS)
+        for chunk in chunks:
+            if columns is None:
+                columns = list(chunk.columns)
+            chunk.to_csv(
+                output_path,
+                columns=columns,
+                index=False,
+                header=first,
+                mode="w" if first else "a",
+                lineterminator="\r\n",
+            )
+            first = False
+            models.update(chunk["model_id"])
+            values.update(chunk["value_a"])
+            values.update(chunk["value_b"])
+            vignettes.update(chunk["vignette_name"])
+            rows += len(chunk)
+        total_rows += rows
+        print(f"{batch_file.name}: {rows} rows")
+
+    print(f"\nCombined: {total_rows} rows -> {output_path}")
     print(f"  Vignettes: {len(vignettes)}")
     print(f"  Models: {len(models)} - {sorted(models)}")
     print(f"  Values: {len(values)} - {sorted(values)}")
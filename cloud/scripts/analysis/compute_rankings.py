@@ -13,17 +13,21 @@ Usage:
 
 Requires:
     pip install numpy scipy pandas choix
+
+Optional:
+    pip install numba   (JIT-compiles the Bradley-Terry inner loop)
 """
 import csv
-import math
+import os
 import sys
-from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from itertools import combinations
 from pathlib import Path
 
 import numpy as np
 import pandas as pd
-from scipy.stats import kendalltau
+from scipy.stats import norm
 
 try:
     import choix
@@ -31,19 +35,45 @@ except ImportError:
     print("Install choix: pip install choix", file=sys.stderr)
     sys.exit(1)
 
+try:
+    from numba import njit
+except ImportError:  # optional: without numba the NumPy iteration is used
+    njit = None
+
 INPUT_DIR = Path(__file__).parent / "output"
 OUTPUT_DIR = INPUT_DIR  # same directory
-
-
-def wilson_score_interval(successes: int, trials: int, z: float = 1.96) -> tuple:
-    """Wilson score confidence interval for a proportion."""
-    if trials == 0:
-        return (0.0, 0.0)
-    p = successes / trials
-    denom = 1 + z * z / trials
-    center = (p + z * z / (2 * trials)) / denom
-    spread = z * math.sqrt((p * (1 - p) + z * z / (4 * trials)) / trials) / denom
-    return (max(0.0, center - spread), min(1.0, center + spread))
+OUTCOMES = ["prioritized", "deprioritized", "neutral"]
+# The only raw-data.csv columns the rankings use; all are low-cardinality strings,
+# loaded as categoricals so groupbys hash integer codes
+USED_COLUMNS = [
+    "model_id", "value_a", "value_b", "value_a_outcome", "value_b_outcome",
+    "vignette_id",
+]
+BOOTSTRAP_SEED = 42
+# Bradley-Terry solver: "newman" (default) or "choix" (I-LSR, kept as a fallback)
+BT_SOLVER = os.getenv("BT_SOLVER", "newman")
+
+
+def wilson_score_interval(successes, trials, z: float = 1.96) -> tuple:
+    """Wilson score confidence interval for a proportion.
+
+    Accepts scalars or NumPy arrays of successes/trials and returns
+    (lower, upper) arrays. Rows with zero trials get (0.0, 0.0).
+    """
+    successes = np.asarray(successes, dtype=np.float64)
+    trials = np.asarray(trials, dtype=np.float64)
+    has_trials = trials > 0
+    z2 = z * z
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inv_t = 1.0 / trials
+        z2_t = z2 * inv_t
+        p = successes * inv_t
+        inv_denom = 1.0 / (1.0 + z2_t)
+        center = (p + 0.5 * z2_t) * inv_denom
+        spread = z * np.sqrt((p * (1.0 - p) + 0.25 * z2_t) * inv_t) * inv_denom
+    lower = np.where(has_trials, np.maximum(0.0, center - spread), 0.0)
+    upper = np.where(has_trials, np.minimum(1.0, center + spread), 0.0)
+    return (lower, upper)
 
 
 def load_raw_data() -> pd.DataFrame:
@@ -52,7 +82,7 @@ def load_raw_data() -> pd.DataFrame:
     if not path.exists():
         print(f"ERROR: {path} not found. Run extract_cross_model_data.py first.", file=sys.stderr)
         sys.exit(1)
-    df = pd.read_csv(path)
+    df = pd.read_csv(path, usecols=USED_COLUMNS, dtype={c: "category" for c in USED_COLUMNS})
     print(f"Loaded {len(df)} rows from {path}")
     return df
 
@@ -67,41 +97,46 @@ def compute_win_rates(df: pd.DataFrame) -> pd.DataFrame:
 
     IMPORTANT: Sum counts, don't average rates.
     """
-    # Build per-model per-value counts
-    counts = defaultdict(lambda: {"prioritized": 0, "deprioritized": 0, "neutral": 0})
+    # Stack the (value_a, outcome_a) and (value_b, outcome_b) columns into one
+    # long frame so every row contributes one (model, value, outcome) record.
+    long = pd.concat([
+        df[["model_id", "value_a", "value_a_outcome"]].rename(
+            columns={"value_a": "value", "value_a_outcome": "outcome"}
+        ),
+        df[["model_id", "value_b", "value_b_outcome"]].rename(
+            columns={"value_b": "value", "value_b_outcome": "outcome"}
+        ),
+    ], ignore_index=True)
 
-    for _, row in df.iterrows():
-        model = row["model_id"]
-        va, vb = row["value_a"], row["value_b"]
-        va_out, vb_out = row["value_a_outcome"], row["value_b_outcome"]
-
-        for value, outcome in [(va, va_out), (vb, vb_out)]:
-            key = (model, value)
-            counts[key][outcome] += 1
-
-    # Convert to rows
-    rows = []
-    for (model, value), c in sorted(counts.items()):
-        pri = c["prioritized"]
-        dep = c["deprioritized"]
-        neu = c["neutral"]
-        total_responses = pri + dep + neu
-        win_rate = pri / total_responses if total_responses > 0 else 0.5
-        ci_lower, ci_upper = wilson_score_interval(pri, total_responses)
-
-        rows.append({
-            "model_id": model,
-            "value_name": value,
-            "global_win_rate": round(win_rate, 4),
-            "total_prioritized": pri,
-            "total_deprioritized": dep,
-            "total_neutral": neu,
-            "total_responses": total_responses,
-            "wilson_ci_lower": round(ci_lower, 4),
-            "wilson_ci_upper": round(ci_upper, 4),
-        })
-
-    result = pd.DataFrame(rows)
+    # Build per-model per-value counts
+    counts = (
+        long.groupby(["model_id", "value", "outcome"], observed=True).size()
+        .unstack("outcome", fill_value=0)
+        .reindex(columns=OUTCOMES, fill_value=0)
+        .reset_index()
+    )
+
+    pri = counts["prioritized"].to_numpy()
+    dep = counts["deprioritized"].to_numpy()
+    neu = counts["neutral"].to_numpy()
+    total_responses = pri + dep + neu
+    win_rate = np.divide(
+        pri, total_responses, out=np.full(len(counts), 0.5), where=total_responses > 0
+    )
+    ci_lower, ci_upper = wilson_score_interval(pri, total_responses)
+
+    # Assemble the result straight from the count columns
+    result = pd.DataFrame({
+        "model_id": counts["model_id"],
+        "value_name": counts["value"],
+        "global_win_rate": np.round(win_rate, 4),
+        "total_prioritized": pri,
+        "total_deprioritized": dep,
+        "total_neutral": neu,
+        "total_responses": total_responses,
+        "wilson_ci_lower": np.round(ci_lower, 4),
+        "wilson_ci_upper": np.round(ci_upper, 4),
+    })
 
     # Add rank within each model (1 = highest win rate)
     result["rank_within_model"] = result.groupby("model_id")["global_win_rate"].rank(
@@ -119,103 +154,221 @@ def build_comparison_matrix(win_rates: pd.DataFrame) -> pd.DataFrame:
     return pivot
 
 
-def compute_bradley_terry(df: pd.DataFrame) -> pd.DataFrame:
-    """Fit Bradley-Terry models per model using raw pairwise outcomes.
+def build_matchups(va: np.ndarray, vb: np.ndarray, a_wins: np.ndarray, b_wins: np.ndarray) -> np.ndarray:
+    """Build (winner_idx, loser_idx) pairs from aligned value-index and win arrays.
 
-    Each transcript where value_a is prioritized counts as a "win" for value_a
-    over value_b. Each transcript where value_b is prioritized counts as a "win"
-    for value_b over value_a. Neutral outcomes are excluded.
+    Neutral rows (neither side prioritized) are skipped.
     """
-    # Get all unique values
-    all_values = sorted(set(df["value_a"].unique()) | set(df["value_b"].unique()))
-    n_values = len(all_values)
-    value_idx = {name: i for i, name in enumerate(all_values)}
+    return np.concatenate([
+        np.stack([va[a_wins], vb[a_wins]], axis=1),
+        np.stack([vb[b_wins], va[b_wins]], axis=1),
+    ])
+
+
+def _newman_iterate_numpy(wins: np.ndarray, tol: float, max_iter: int) -> tuple:
+    """Newman MM iteration on a win matrix; returns (strengths, converged)."""
+    pi = np.ones(wins.shape[0])
+    for _ in range(max_iter):
+        pair_sum = pi[:, None] + pi[None, :]
+        num = (wins * pi[None, :] / pair_sum).sum(axis=1)
+        den = (wins.T / pair_sum).sum(axis=1)
+        pi_new = num / den
+        pi_new /= np.exp(np.log(pi_new).mean())  # geometric-mean normalize
+        if np.abs(pi_new - pi).sum() < tol:
+            return pi_new, True
+        pi = pi_new
+    return pi, False
+
+
+def _newman_iterate_loops(wins, tol, max_iter):
+    """Same iteration as _newman_iterate_numpy, written as plain loops for numba."""
+    n = wins.shape[0]
+    pi = np.ones(n)
+    for _ in range(max_iter):
+        pi_new = np.empty(n)
+        for i in range(n):
+            num = 0.0
+            den = 0.0
+            for j in range(n):
+                if i != j:
+                    pair_sum = pi[i] + pi[j]
+                    num += wins[i, j] * pi[j] / pair_sum
+                    den += wins[j, i] / pair_sum
+            pi_new[i] = num / den
+        scale = np.exp(np.log(pi_new).mean())  # geometric-mean normalize
+        diff = 0.0
+        for i in range(n):
+            pi_new[i] /= scale
+            diff += abs(pi_new[i] - pi[i])
+        pi = pi_new
+        if diff < tol:
+            return pi, True
+    return pi, False
+
+
+_newman_iterate = njit(cache=True)(_newman_iterate_loops) if njit else _newman_iterate_numpy
+
+
+def fit_bt_newman(n_values: int, matchups: np.ndarray, tol: float = 1e-8, max_iter: int = 200) -> np.ndarray:
+    """Fit Bradley-Terry log-strengths with Newman's (2022) MM iteration.
+
+    Same maximum-likelihood fixed point as choix.ilsr_pairwise, but each step is
+    a couple of passes over the n_values x n_values win matrix (compiled with
+    numba when it is installed). Returns log-strengths centered at 0. Raises
+    RuntimeError if a value has no wins or no losses (its MLE is infinite) or
+    the iteration does not converge.
+    """
+    winners, losers = matchups[:, 0], matchups[:, 1]
+    wins = np.bincount(winners * n_values + losers, minlength=n_values * n_values)
+    wins = wins.reshape(n_values, n_values).astype(np.float64)
+    if not ((wins.sum(axis=1) > 0) & (wins.sum(axis=0) > 0)).all():
+        raise RuntimeError("Every value needs at least one win and one loss for a finite BT estimate")
 
-    models = sorted(df["model_id"].unique())
-    n_bootstrap = 1000
+    pi, converged = _newman_iterate(wins, tol, max_iter)
+    if not converged:
+        raise RuntimeError(f"Did not converge after {max_iter} iterations")
+    log_pi = np.log(pi)
+    return log_pi - log_pi.mean()
 
-    results = []
 
-    for model in models:
-        model_df = df[df["model_id"] == model]
+def fit_bt(n_values: int, matchups: np.ndarray) -> np.ndarray:
+    """Fit Bradley-Terry log-strengths with the solver selected by BT_SOLVER.
 
-        # Build matchup list: (winner_idx, loser_idx) pairs
-        matchups = []
-        for _, row in model_df.iterrows():
-            va_idx = value_idx[row["value_a"]]
-            vb_idx = value_idx[row["value_b"]]
+    Newman's iteration falls back to choix when it cannot produce a finite
+    estimate, so degenerate samples keep their previous behavior.
+    """
+    if BT_SOLVER != "choix":
+        try:
+            return fit_bt_newman(n_values, matchups)
+        except RuntimeError:
+            pass
+    return choix.ilsr_pairwise(n_values, matchups)
+
+
+def bootstrap_bt_chunk(
+    seed: np.random.SeedSequence,
+    n_iter: int,
+    vig_matchups: list,
+    n_values: int,
+    fallback: np.ndarray,
+) -> np.ndarray:
+    """Run n_iter vignette-level bootstrap BT fits; returns an (n_iter, n_values) array.
+
+    Runs in a worker process, so it only touches its own seeded RNG.
+    """
+    rng = np.random.default_rng(seed)
+    n_vignettes = len(vig_matchups)
+    vig_lengths = np.array([len(m) for m in vig_matchups])
+    boot_strengths = np.empty((n_iter, n_values))
 
-            if row["value_a_outcome"] == "prioritized":
-                matchups.append((va_idx, vb_idx))
-            elif row["value_b_outcome"] == "prioritized":
-                matchups.append((vb_idx, va_idx))
-            # neutral: skip
+    # Resample vignettes with replacement: all iterations drawn in one block
+    samples = rng.integers(0, n_vignettes, size=(n_iter, n_vignettes))
 
-        if len(matchups) < 10:
-            print(f"  WARNING: {model} has only {len(matchups)} matchups, skipping BT")
+    for b, boot_vignettes in enumerate(samples):
+        if vig_lengths[boot_vignettes].sum() < 10:
+            boot_strengths[b] = fallback
             continue
 
-        matchups_arr = np.array(matchups)
+        boot_matchups = np.concatenate([vig_matchups[i] for i in boot_vignettes])
 
-        # Fit BT model
         try:
-            params = choix.ilsr_pairwise(n_values, matchups_arr)
-        except Exception as e:
-            print(f"  WARNING: BT fit failed for {model}: {e}")
-            continue
+            boot_params = fit_bt(n_values, boot_matchups)
+            boot_params = boot_params - boot_params.mean()
+            boot_strengths[b] = np.exp(boot_params)
+        except Exception:
+            boot_strengths[b] = fallback
+
+    return boot_strengths
 
-        # Normalize: center at 0, exponentiate for strengths
-        params = params - params.mean()
-        strengths = np.exp(params)
-
-        # Bootstrap CIs (resample at vignette level to respect clustering)
-        boot_strengths = np.zeros((n_bootstrap, n_values))
-        vignette_groups = model_df.groupby("vignette_id")
-        vignette_keys = list(vignette_groups.groups.keys())
-
-        for b in range(n_bootstrap):
-            # Resample vignettes with replacement
-            boot_vignettes = np.random.choice(vignette_keys, size=len(vignette_keys), replace=True)
-            boot_matchups = []
-            for vig_id in boot_vignettes:
-                vig_df = vignette_groups.get_group(vig_id)
-                for _, row in vig_df.iterrows():
-                    va_idx = value_idx[row["value_a"]]
-                    vb_idx = value_idx[row["value_b"]]
-                    if row["value_a_outcome"] == "prioritized":
-                        boot_matchups.append((va_idx, vb_idx))
-                    elif row["value_b_outcome"] == "prioritized":
-                        boot_matchups.append((vb_idx, va_idx))
-
-            if len(boot_matchups) < 10:
-                boot_strengths[b] = strengths  # fallback
+
+def compute_bradley_terry(df: pd.DataFrame) -> pd.DataFrame:
+    """Fit Bradley-Terry models per model using raw pairwise outcomes.
+
+    Each transcript where value_a is prioritized counts as a "win" for value_a
+    over value_b. Each transcript where value_b is prioritized counts as a "win"
+    for value_b over value_a. Neutral outcomes are excluded.
+    """
+    # Get all unique values
+    all_values = sorted(set(df["value_a"].unique()) | set(df["value_b"].unique()))
+    n_values = len(all_values)
+    value_idx = {name: i for i, name in enumerate(all_values)}
+
+    # Encode each row once: value indices and which side (if any) won
+    va_idx = df["value_a"].map(value_idx).to_numpy(np.int32)
+    vb_idx = df["value_b"].map(value_idx).to_numpy(np.int32)
+    a_wins = (df["value_a_outcome"] == "prioritized").to_numpy()
+    b_wins = (df["value_b_outcome"] == "prioritized").to_numpy() & ~a_wins
+    vignette_codes = pd.factorize(df["vignette_id"], sort=True)[0]
+
+    # Positional row indices per model, so each model is sliced without rescanning df
+    idx_by_model = df.groupby("model_id", observed=True).indices
+    models = sorted(idx_by_model)
+    n_bootstrap = 1000
+    n_workers = os.cpu_count() or 1
+    # Split each model's bootstrap into one chunk per worker, each with its own RNG stream
+    chunk_sizes = [len(c) for c in np.array_split(np.arange(n_bootstrap), n_workers) if len(c)]
+    seed_seq = np.random.SeedSequence(BOOTSTRAP_SEED)
+
+    # One pool for all models: every model's bootstrap chunks are queued up
+    # front, so workers stay busy while earlier models are being fitted
+    fitted = []
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        for model in models:
+            rows = idx_by_model[model]
+            va, vb, aw, bw, vig = va_idx[rows], vb_idx[rows], a_wins[rows], b_wins[rows], vignette_codes[rows]
+
+            # Build matchup array: (winner_idx, loser_idx) pairs
+            matchups_arr = build_matchups(va, vb, aw, bw)
+
+            if len(matchups_arr) < 10:
+                print(f"  WARNING: {model} has only {len(matchups_arr)} matchups, skipping BT")
                 continue
 
+            # Fit BT model
             try:
-                boot_params = choix.ilsr_pairwise(n_values, np.array(boot_matchups))
-                boot_params = boot_params - boot_params.mean()
-                boot_strengths[b] = np.exp(boot_params)
-            except Exception:
-                boot_strengths[b] = strengths
-
-        ci_lower = np.percentile(boot_strengths, 2.5, axis=0)
-        ci_upper = np.percentile(boot_strengths, 97.5, axis=0)
-
-        # Probability of beating an "average" value
-        total_strength = strengths.sum()
-        avg_strength = total_strength / n_values
-        prob_vs_avg = strengths / (strengths + avg_strength)
-
-        for i, value_name in enumerate(all_values):
-            results.append({
-                "model_id": model,
-                "value_name": value_name,
-                "bt_strength": round(strengths[i], 4),
-                "bt_log_strength": round(params[i], 4),
-                "bt_ci_lower": round(ci_lower[i], 4),
-                "bt_ci_upper": round(ci_upper[i], 4),
-                "bt_prob_vs_avg": round(prob_vs_avg[i], 4),
-            })
+                params = fit_bt(n_values, matchups_arr)
+            except Exception as e:
+                print(f"  WARNING: BT fit failed for {model}: {e}")
+                continue
+
+            # Normalize: center at 0, exponentiate for strengths
+            params = params - params.mean()
+            strengths = np.exp(params)
+
+            # Bootstrap CIs (resample at vignette level to respect clustering).
+            # Matchups are built once per vignette and shipped to the workers, so
+            # each bootstrap iteration is just a concatenation of arrays.
+            order = np.argsort(vig, kind="stable")
+            vig_groups = np.split(order, np.flatnonzero(np.diff(vig[order])) + 1)
+            vig_matchups = [build_matchups(va[g], vb[g], aw[g], bw[g]) for g in vig_groups]
+            futures = [
+                pool.submit(bootstrap_bt_chunk, seed, n_iter, vig_matchups, n_values, strengths)
+                for seed, n_iter in zip(seed_seq.spawn(len(chunk_sizes)), chunk_sizes)
+            ]
+            fitted.append((model, params, strengths, futures))
+
+        results = []
+        for model, params, strengths, futures in fitted:
+            boot_strengths = np.concatenate([f.result() for f in futures])
+
+            ci_lower = np.percentile(boot_strengths, 2.5, axis=0)
+            ci_upper = np.percentile(boot_strengths, 97.5, axis=0)
+
+            # Probability of beating an "average" value
+            total_strength = strengths.sum()
+            avg_strength = total_strength / n_values
+            prob_vs_avg = strengths / (strengths + avg_strength)
+
+            for i, value_name in enumerate(all_values):
+                results.append({
+                    "model_id": model,
+                    "value_name": value_name,
+                    "bt_strength": round(strengths[i], 4),
+                    "bt_log_strength": round(params[i], 4),
+                    "bt_ci_lower": round(ci_lower[i], 4),
+                    "bt_ci_upper": round(ci_upper[i], 4),
+                    "bt_prob_vs_avg": round(prob_vs_avg[i], 4),
+                })
 
     result = pd.DataFrame(results)
     if len(result) > 0:
@@ -226,27 +379,90 @@ def compute_bradley_terry(df: pd.DataFrame) -> pd.DataFrame:
     return result
 
 
+@lru_cache(maxsize=None)
+def _inversion_cdf(n: int) -> np.ndarray:
+    """CDF of the number of inversions in a uniformly random permutation of n items."""
+    counts = np.ones(1)
+    for i in range(2, n + 1):
+        counts = np.convolve(counts, np.ones(i))
+    return np.cumsum(counts) / counts.sum()
+
+
+def kendall_tau_matrix(ranks: np.ndarray) -> tuple:
+    """Kendall tau-b and two-sided p-values for every pair of rows in a rank matrix.
+
+    Matches scipy.stats.kendalltau(method="auto") but amortizes the work: each
+    row's pairwise sign pattern is built once and all concordant-minus-discordant
+    counts come from a single matrix product. Returns two (M, M) arrays.
+    """
+    n_rows, n = ranks.shape
+    iu = np.triu_indices(n, k=1)
+    signs = np.sign(ranks[:, :, None] - ranks[:, None, :])[:, iu[0], iu[1]].astype(np.float64)
+    con_minus_dis = signs @ signs.T
+    tot = n * (n - 1) // 2
+    untied = (signs != 0).sum(axis=1).astype(np.float64)  # tot - ties, per row
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tau = np.clip(con_minus_dis / np.sqrt(untied)[:, None] / np.sqrt(untied)[None, :], -1.0, 1.0)
+
+    # Tie statistics per row, as used by the asymptotic variance
+    ties = np.zeros((n_rows, 3))
+    for r in range(n_rows):
+        cnt = np.bincount(ranks[r]).astype(np.float64)
+        cnt = cnt[cnt > 1]
+        ties[r] = [(cnt * (cnt - 1) / 2).sum(), (cnt * (cnt - 1) * (cnt - 2)).sum(),
+                   (cnt * (cnt - 1) * (2 * cnt + 5)).sum()]
+    tie, t0, t1 = ties[:, 0], ties[:, 1], ties[:, 2]
+
+    m = n * (n - 1.0)
+    var = ((m * (2 * n + 5) - t1[:, None] - t1[None, :]) / 18
+           + 2 * tie[:, None] * tie[None, :] / m
+           + t0[:, None] * t0[None, :] / (9 * m * (n - 2)))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p_value = 2 * norm.sf(np.abs(con_minus_dis) / np.sqrt(var))
+
+    # Exact null distribution when neither row has ties (scipy's "auto" rule)
+    dis = np.rint((tot - con_minus_dis) / 2).astype(np.int64)
+    tail = np.minimum(dis, tot - dis)
+    no_ties = (tie[:, None] == 0) & (tie[None, :] == 0)
+    exact = no_ties & ((n <= 33) | (tail <= 1))
+    if exact.any():
+        cdf = _inversion_cdf(n)
+        p_value[exact] = np.minimum(1.0, 2 * cdf[tail[exact]])
+
+    degenerate = (untied[:, None] == 0) | (untied[None, :] == 0)
+    tau[degenerate] = np.nan
+    p_value[degenerate] = np.nan
+    return tau, p_value
+
+
 def compute_divergence(win_rates: pd.DataFrame) -> pd.DataFrame:
     """Compute pairwise rank divergence between all model pairs."""
     models = sorted(win_rates["model_id"].unique())
     all_values = sorted(win_rates["value_name"].unique())
 
-    # Build rank lookup: model -> {value: rank}
-    rank_lookup = {}
-    for model in models:
-        model_data = win_rates[win_rates["model_id"] == model].set_index("value_name")
-        rank_lookup[model] = {v: model_data.loc[v, "rank_within_model"] for v in all_values if v in model_data.index}
+    # Dense rank matrix: one row per model, one column per value (0 = missing)
+    rank_matrix = (
+        win_rates.pivot(index="model_id", columns="value_name", values="rank_within_model")
+        .reindex(index=models, columns=all_values)
+        .fillna(0)
+        .to_numpy(np.int64)
+    )
+    # Tie-break equal rank differences by value name, descending
+    value_order = -np.arange(len(all_values))
+    tau_matrix, p_matrix = kendall_tau_matrix(rank_matrix)
 
     rows = []
-    for model_a, model_b in combinations(models, 2):
-        ranks_a = [rank_lookup[model_a].get(v, 0) for v in all_values]
-        ranks_b = [rank_lookup[model_b].get(v, 0) for v in all_values]
+    for i, j in combinations(range(len(models)), 2):
+        model_a, model_b = models[i], models[j]
+        ranks_a = rank_matrix[i]
+        ranks_b = rank_matrix[j]
 
-        tau, p_value = kendalltau(ranks_a, ranks_b)
+        tau, p_value = tau_matrix[i, j], p_matrix[i, j]
 
         # Top diverging values by rank difference
-        rank_diffs = [(abs(ra - rb), v, ra, rb) for v, ra, rb in zip(all_values, ranks_a, ranks_b)]
-        rank_diffs.sort(reverse=True)
+        abs_diffs = np.abs(ranks_a - ranks_b)
+        top = np.lexsort((value_order, -abs_diffs))[:3]
 
         row = {
             "model_a": model_a,
@@ -255,12 +471,11 @@ def compute_divergence(win_rates: pd.DataFrame) -> pd.DataFrame:
             "tau_p_value": round(p_value, 6),
         }
 
-        for k in range(min(3, len(rank_diffs))):
-            diff, val, ra, rb = rank_diffs[k]
-            row[f"diverging_value_{k+1}"] = val
-            row[f"rank_diff_{k+1}"] = int(diff)
-            row[f"rank_a_{k+1}"] = int(ra)
-            row[f"rank_b_{k+1}"] = int(rb)
+        for k, v in enumerate(top):
+            row[f"diverging_value_{k+1}"] = all_values[v]
+            row[f"rank_diff_{k+1}"] = int(abs_diffs[v])
+            row[f"rank_a_{k+1}"] = int(ranks_a[v])
+            row[f"rank_b_{k+1}"] = int(ranks_b[v])
 
         rows.append(row)
 
@@ -9,26 +9,49 @@ Usage:
     Or for local dev:
     VALUERANK_API_URL=http://localhost:3031/graphql python scripts/analysis/extract_cross_model_data.py
 
+    Runs are fetched concurrently; set VALUERANK_FETCH_WORKERS to change the
+    number of threads (default 8).
+
 Requires:
-    pip install requests
+    pip install requests numpy pandas
+
+Optional:
+    pip install orjson   (faster decoding of large transcript responses)
 """
 import requests
 import json
-import csv
 import os
 import sys
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib JSON parser
+    orjson = None
+
 API_URL = os.getenv("VALUERANK_API_URL", "https://api.valuerank.org/graphql")
 API_KEY = os.getenv("VALUERANK_API_KEY", "")
 OUTPUT_DIR = Path(__file__).parent / "output"
 CLOUD_DIR = Path(__file__).parent.parent.parent  # cloud/
 MAPPING_FILE = Path(__file__).parent / "run-mapping.json"
+FETCH_WORKERS = int(os.getenv("VALUERANK_FETCH_WORKERS", "8"))
+
+# One keep-alive session shared by all fetch threads
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+SESSION.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
 
 
+@lru_cache(maxsize=1)
 def get_auth_headers() -> dict:
-    """Get authentication headers for the API."""
+    """Get authentication headers for the API (computed once per process)."""
     if API_KEY:
         return {"X-API-Key": API_KEY}
 
@@ -60,13 +83,13 @@ def graphql(query: str, variables: dict | None = None) -> dict:
         "Content-Type": "application/json",
         **get_auth_headers(),
     }
-    resp = requests.post(
+    resp = SESSION.post(
         API_URL,
         json={"query": query, "variables": variables or {}},
         headers=headers,
     )
     resp.raise_for_status()
-    data = resp.json()
+    data = orjson.loads(resp.content) if orjson else resp.json()
     if "errors" in data:
         raise RuntimeError(f"GraphQL errors: {json.dumps(data['errors'], indent=2)}")
     return data["data"]
@@ -89,7 +112,7 @@ def get_transcripts_for_run(run_id: str) -> list:
     import time
     all_transcripts = []
     offset = 0
-    batch_size = 500
+    batch_size = 1000  # API maximum for run.transcripts(limit:)
 
     while True:
         for attempt in range(3):
@@ -98,7 +121,7 @@ def get_transcripts_for_run(run_id: str) -> list:
                     query($runId: ID!, $limit: Int!, $offset: Int!) {
                         run(id: $runId) {
                             transcripts(limit: $limit, offset: $offset) {
-                                id modelId scenarioId decisionCode sampleIndex
+                                modelId scenarioId decisionCode sampleIndex
                                 scenario { content }
                             }
                         }
@@ -107,7 +130,7 @@ def get_transcripts_for_run(run_id: str) -> list:
 
                 if data.get("run") is None:
                     if attempt < 2:
-                        print(f"    Run returned null, retrying ({attempt+1}/3)...")
+                        print(f"    Run {run_id} returned null, retrying ({attempt+1}/3)...")
                         time.sleep(2)
                         continue
                     print(f"    WARNING: Run {run_id} returned null after 3 attempts")
@@ -117,7 +140,7 @@ def get_transcripts_for_run(run_id: str) -> list:
                 break
             except Exception as e:
                 if attempt < 2:
-                    print(f"    Error: {e}, retrying ({attempt+1}/3)...")
+                    print(f"    Run {run_id} error: {e}, retrying ({attempt+1}/3)...")
                     time.sleep(2)
                 else:
                     raise
@@ -147,8 +170,8 @@ def extract_value_pair(definition_content) -> tuple:
     return dimensions[0]["name"], dimensions[1]["name"]
 
 
-def decision_to_outcome(decision_code: str) -> tuple:
-    """Map decision code to (value_a_outcome, value_b_outcome).
+def decision_to_outcome(decision_codes) -> tuple:
+    """Map decision codes to (value_a_outcome, value_b_outcome) arrays.
 
     Decision scale:
         5 = strongly support value_a
@@ -157,15 +180,28 @@ def decision_to_outcome(decision_code: str) -> tuple:
         2 = somewhat support value_b
         1 = strongly support value_b
 
-    Returns: (value_a_outcome, value_b_outcome)
+    Accepts a scalar or array-like of codes and returns two arrays of
+    outcome strings aligned with the input.
     """
-    code = int(decision_code)
-    if code >= 4:
-        return ("prioritized", "deprioritized")
-    elif code <= 2:
-        return ("deprioritized", "prioritized")
-    else:
-        return ("neutral", "neutral")
+    codes = np.asarray(decision_codes, dtype=np.int64)
+    a_wins = codes >= 4
+    b_wins = codes <= 2
+    va_outcome = np.where(a_wins, "prioritized", np.where(b_wins, "deprioritized", "neutral"))
+    vb_outcome = np.where(a_wins, "deprioritized", np.where(b_wins, "prioritized", "neutral"))
+    return (va_outcome, vb_outcome)
+
+
+def intensity_column(tdf: pd.DataFrame, value_name: str) -> pd.Series:
+    """Return a value's scenario dimension score per transcript (<NA> if missing).
+
+    tdf comes from pd.json_normalize, so nested scenario dimensions are
+    flattened into "scenario.content.dimensions.<value>" columns.
+    """
+    column = f"scenario.content.dimensions.{value_name}"
+    if column not in tdf:
+        return pd.Series(pd.NA, index=tdf.index, dtype=object)
+    # Missing scores turn the column into float64; convert back so 3 is written as "3"
+    return tdf[column].convert_dtypes()
 
 
 def main():
@@ -183,57 +219,60 @@ def main():
 
     # Cache definitions to avoid re-fetching
     def_cache: dict = {}
-    rows = []
-
-    for i, entry in enumerate(run_mapping, 1):
-        run_id = entry["run_id"]
-        def_id = entry["def_id"]
-        name = entry["name"]
-
-        print(f"\n[{i}/{len(run_mapping)}] {name}")
-        print(f"  Run: {run_id}")
-
-        # Get definition content (cached)
-        if def_id not in def_cache:
-            def_cache[def_id] = get_definition(def_id)
-        definition = def_cache[def_id]
-        value_a, value_b = extract_value_pair(definition["content"])
-
-        # Get transcripts
-        transcripts = get_transcripts_for_run(run_id)
-        print(f"  Got {len(transcripts)} transcripts  (values: {value_a} vs {value_b})")
-
-        skipped = 0
-        for t in transcripts:
-            dc = t["decisionCode"]
-            if dc is None or not str(dc).isdigit():
-                skipped += 1
+    frames = []
+
+    # Fetch transcripts for all runs concurrently. pool.map yields results in
+    # run order, so each run is processed (and its transcripts released) as
+    # soon as it arrives rather than holding every run in memory first
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+        fetched = pool.map(get_transcripts_for_run, [entry["run_id"] for entry in run_mapping])
+
+        for i, (entry, transcripts) in enumerate(zip(run_mapping, fetched), 1):
+            run_id = entry["run_id"]
+            def_id = entry["def_id"]
+            name = entry["name"]
+
+            print(f"\n[{i}/{len(run_mapping)}] {name}")
+            print(f"  Run: {run_id}")
+
+            # Get definition content (cached)
+            if def_id not in def_cache:
+                def_cache[def_id] = get_definition(def_id)
+            definition = def_cache[def_id]
+            value_a, value_b = extract_value_pair(definition["content"])
+
+            print(f"  Got {len(transcripts)} transcripts  (values: {value_a} vs {value_b})")
+            if not transcripts:
                 continue
 
-            va_outcome, vb_outcome = decision_to_outcome(dc)
-            scenario_content = t.get("scenario", {})
-            if scenario_content:
-                scenario_content = scenario_content.get("content", {})
-            scenario_dims = scenario_content.get("dimensions", {}) if scenario_content else {}
+            # Keep only transcripts with a numeric decision code, then map outcomes
+            # for the whole run at once
+            tdf = pd.json_normalize(transcripts, sep=".")
+            valid = tdf["decisionCode"].astype(str).str.isdigit().to_numpy()
+            tdf = tdf[valid]
+            skipped = int((~valid).sum())
 
-            rows.append({
+            decision_codes = tdf["decisionCode"].astype(int).to_numpy()
+            va_outcome, vb_outcome = decision_to_outcome(decision_codes)
+
+            frames.append(pd.DataFrame({
                 "vignette_name": name,
                 "vignette_id": def_id,
                 "run_id": run_id,
                 "value_a": value_a,
                 "value_b": value_b,
-                "model_id": t["modelId"],
-                "decision_code": int(t["decisionCode"]),
+                "model_id": tdf["modelId"].to_numpy(),
+                "decision_code": decision_codes,
                 "value_a_outcome": va_outcome,
                 "value_b_outcome": vb_outcome,
-                "value_a_intensity": scenario_dims.get(value_a),
-                "value_b_intensity": scenario_dims.get(value_b),
-                "scenario_id": t.get("scenarioId", ""),
-                "sample_index": t["sampleIndex"],
-            })
+                "value_a_intensity": intensity_column(tdf, value_a).array,
+                "value_b_intensity": intensity_column(tdf, value_b).array,
+                "scenario_id": tdf["scenarioId"].to_numpy() if "scenarioId" in tdf else "",
+                "sample_index": tdf["sampleIndex"].to_numpy(),
+            }))
 
-        if skipped > 0:
-            print(f"  Skipped {skipped} error/null transcripts")
+            if skipped > 0:
+                print(f"  Skipped {skipped} error/null transcripts")
 
     # Write CSV
     output_path = OUTPUT_DIR / "raw-data.csv"
@@ -244,21 +283,15 @@ def main():
         "value_a_intensity", "value_b_intensity",
         "scenario_id", "sample_index",
     ]
-
-    with open(output_path, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
+    rows = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=fieldnames)
+    rows.to_csv(output_path, columns=fieldnames, index=False, lineterminator="\r\n")
 
     print(f"\n{'=' * 50}")
     print(f"Wrote {len(rows)} rows to {output_path}")
 
     # Summary stats
-    models = set(r["model_id"] for r in rows)
-    values = set()
-    for r in rows:
-        values.add(r["value_a"])
-        values.add(r["value_b"])
+    models = set(rows["model_id"])
+    values = set(rows["value_a"]) | set(rows["value_b"])
 
     print(f"  Models: {len(models)} - {sorted(models)}")
     print(f"  Values: {len(values)} - {sorted(values)}")
@@ -13,51 +13,55 @@ The input JSON should have structure:
 }
 """
 import json
-import csv
 import sys
 from pathlib import Path
 
-def decision_to_outcome(code_str):
-    code = int(code_str)
-    if code >= 4:
-        return ("prioritized", "deprioritized")
-    elif code <= 2:
-        return ("deprioritized", "prioritized")
-    else:
-        return ("neutral", "neutral")
+import numpy as np
+import pandas as pd
 
-def process_file(input_path, output_path, append=False):
-    with open(input_path) as f:
-        data = json.load(f)
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib JSON parser
+    orjson = None
 
-    rows = []
-    for t in data["transcripts"]:
-        dc = t.get("decisionCode")
-        if dc is None or dc == "error":
-            continue
-        va_out, vb_out = decision_to_outcome(dc)
-        rows.append({
-            "vignette_name": data["vignette_name"],
-            "run_id": data["run_id"],
-            "value_a": data["value_a"],
-            "value_b": data["value_b"],
-            "model_id": t["modelId"],
-            "decision_code": int(dc),
-            "value_a_outcome": va_out,
-            "value_b_outcome": vb_out,
-        })
+def decision_to_outcome(codes):
+    codes = np.asarray(codes, dtype=np.int64)
+    a_wins = codes >= 4
+    b_wins = codes <= 2
+    va_out = np.where(a_wins, "prioritized", np.where(b_wins, "deprioritized", "neutral"))
+    vb_out = np.where(a_wins, "deprioritized", np.where(b_wins, "prioritized", "neutral"))
+    return (va_out, vb_out)
 
-    mode = "a" if append else "w"
-    write_header = not append or not Path(output_path).exists() or Path(output_path).stat().st_size == 0
+def process_file(input_path, output_path, append=False):
+    if orjson:
+        data = orjson.loads(Path(input_path).read_bytes())
+    else:
+        with open(input_path) as f:
+            data = json.load(f)
 
     fieldnames = ["vignette_name", "run_id", "value_a", "value_b", "model_id",
                   "decision_code", "value_a_outcome", "value_b_outcome"]
 
-    with open(output_path, mode, newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        if write_header:
-            writer.writeheader()
-        writer.writerows(rows)
+    tdf = pd.DataFrame(data["transcripts"], columns=["modelId", "decisionCode"])
+    tdf = tdf[tdf["decisionCode"].notna() & (tdf["decisionCode"] != "error")]
+    codes = tdf["decisionCode"].astype(int).to_numpy()
+    va_out, vb_out = decision_to_outcome(codes)
+
+    rows = pd.DataFrame({
+        "vignette_name": data["vignette_name"],
+        "run_id": data["run_id"],
+        "value_a": data["value_a"],
+        "value_b": data["value_b"],
+        "model_id": tdf["modelId"].to_numpy(),
+        "decision_code": codes,
+        "value_a_outcome": va_out,
+        "value_b_outcome": vb_out,
+    }, columns=fieldnames)
+
+    mode = "a" if append else "w"
+    write_header = not append or not Path(output_path).exists() or Path(output_path).stat().st_size == 0
+
+    rows.to_csv(output_path, mode=mode, header=write_header, index=False, lineterminator="\r\n")
 
     print(f"Wrote {len(rows)} rows ({'appended' if append else 'new'}) to {output_path}")
     return len(rows)
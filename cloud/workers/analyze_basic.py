@@ -45,12 +45,12 @@ Output format (see plan.md AnalysisOutput schema):
 """
 
 import json
-import sys
 import time
 from collections import defaultdict
 from datetime import datetime, timezone
 from typing import Any
 
+from common import json_io
 from common.errors import ErrorCode, ValidationError
 from common.logging import get_logger
 from analyze_basic_aggregation import (
@@ -348,7 +348,7 @@ def main() -> None:
     """Main entry point."""
     try:
         # Read JSON input from stdin
-        input_data = sys.stdin.read()
+        input_data = json_io.read_stdin()
         if not input_data.strip():
             result = {
                 "success": False,
@@ -358,11 +358,11 @@ def main() -> None:
                     "retryable": False,
                 },
             }
-            print(json.dumps(result))
+            json_io.write_stdout(result)
             return
 
         try:
-            data = json.loads(input_data)
+            data = json_io.loads(input_data)
         except json.JSONDecodeError as err:
             result = {
                 "success": False,
@@ -372,7 +372,7 @@ def main() -> None:
                     "retryable": False,
                 },
             }
-            print(json.dumps(result))
+            json_io.write_stdout(result)
             return
 
         # Validate input
@@ -383,14 +383,14 @@ def main() -> None:
                 "success": False,
                 "error": err.to_dict(),
             }
-            print(json.dumps(result))
+            json_io.write_stdout(result)
             return
 
         # Run analysis
         result = run_analysis(data)
 
         # Output result
-        print(json.dumps(result))
+        json_io.write_stdout(result)
 
     except Exception as err:
         log.error("Analysis failed", err=str(err))
@@ -402,7 +402,7 @@ def main() -> None:
                 "retryable": True,
             },
         }
-        print(json.dumps(result))
+        json_io.write_stdout(result)
 
 
 if __name__ == "__main__":
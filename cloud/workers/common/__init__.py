@@ -5,6 +5,7 @@ Includes:
 - errors: Error types with retry classification
 - logging: Structured JSON logging to stderr
 - config: Environment variable loading
+- json_io: Fast JSON stdin/stdout encoding (orjson when available)
 - llm_adapters: LLM provider adapters
 """
 
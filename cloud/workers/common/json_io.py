@@ -0,0 +1,62 @@
+"""
+JSON encoding for the worker stdin/stdout protocol.
+
+Uses orjson when it is installed (several times faster on large payloads such
+as expanded scenario sets) and falls back to the stdlib codec otherwise.
+"""
+
+import json
+import sys
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib JSON codec
+    orjson = None  # type: ignore[assignment]
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Decode a JSON document.
+
+    Raises:
+        json.JSONDecodeError: If the input is not valid JSON
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson rejects input the stdlib accepts (lone surrogate escapes
+            # such as a truncated emoji, NaN/Infinity); retry with the stdlib
+            pass
+    return json.loads(data)
+
+
+def read_stdin() -> Union[str, bytes]:
+    """Read all of stdin, as raw bytes when the stream exposes them."""
+    buffer = getattr(sys.stdin, "buffer", None)
+    if buffer is not None:
+        return buffer.read()
+    return sys.stdin.read()
+
+
+def write_stdout(obj: Any) -> None:
+    """Write obj to stdout as a single line of JSON."""
+    if orjson is None:
+        print(json.dumps(obj))
+        return
+
+    # OPT_SERIALIZE_NUMPY: analysis workers emit np.float64/np.int64 scalars,
+    # which orjson otherwise rejects with a TypeError
+    data = orjson.dumps(
+        obj,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE,
+    )
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        # Text-only streams (e.g. StringIO in tests) have no byte buffer
+        sys.stdout.write(data.decode())
+        return
+
+    sys.stdout.flush()
+    buffer.write(data)
+    buffer.flush()
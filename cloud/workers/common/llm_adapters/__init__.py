@@ -24,7 +24,13 @@ Usage:
 from .types import LLMResponse, StreamChunk
 
 # Base class and HTTP utilities
-from .base import BaseLLMAdapter, is_billing_exhaustion_response, is_rate_limit_response, post_json
+from .base import (
+    BaseLLMAdapter,
+    classify_error_response,
+    is_billing_exhaustion_response,
+    is_rate_limit_response,
+    post_json,
+)
 
 # Backward compatibility aliases for internal functions (used in tests)
 _is_rate_limit_response = is_rate_limit_response
@@ -75,6 +81,7 @@ __all__ = [
     "StreamChunk",
     # Base and HTTP utilities
     "BaseLLMAdapter",
+    "classify_error_response",
     "is_rate_limit_response",
     "is_billing_exhaustion_response",
     "post_json",
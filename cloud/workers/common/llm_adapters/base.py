@@ -4,20 +4,34 @@ Base adapter class and HTTP utilities for LLM providers.
 
 from abc import ABC, abstractmethod
 from contextvars import ContextVar
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 import hashlib
 import json
+import random
+import re
 import time
-from typing import Any, Optional
+from typing import Any, Literal, Mapping, Optional
+from urllib.parse import urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib JSON parser
+    orjson = None  # type: ignore[assignment]
 
 from ..errors import ErrorCode, LLMError
 from ..logging import get_logger
+from .circuit_breaker import get_circuit_breaker
 from .constants import (
     DEFAULT_TIMEOUT,
     MAX_HTTP_RETRIES,
+    MAX_RATE_LIMIT_BACKOFF_SECONDS,
     MAX_RATE_LIMIT_RETRIES,
     RATE_LIMIT_BACKOFF_SECONDS,
+    RATE_LIMIT_JITTER,
     RETRY_BACKOFF_SECONDS,
 )
 from .types import LLMResponse
@@ -104,6 +118,37 @@ UNSUPPORTED_TEMPERATURE_PATTERNS = [
     "extra inputs are not permitted",
 ]
 
+
+def _compile_patterns(patterns: list[str]) -> re.Pattern[str]:
+    """Compile literal patterns into one case-insensitive alternation."""
+    return re.compile("|".join(re.escape(pattern) for pattern in patterns), re.IGNORECASE)
+
+
+_UNSUPPORTED_TEMPERATURE_RE = _compile_patterns(UNSUPPORTED_TEMPERATURE_PATTERNS)
+
+# Rate-limit and billing markers in one scan. Each alternative sits in a
+# lookahead so overlapping markers (e.g. "quota exceeded your current quota")
+# are all seen; match.lastgroup says which class matched at each position.
+_ERROR_TEXT_RE = re.compile(
+    "(?=(?P<unambiguous_billing>{})|(?P<rate_limit>{})|(?P<billing>{}))".format(
+        _compile_patterns(UNAMBIGUOUS_BILLING_PATTERNS).pattern,
+        _compile_patterns(RATE_LIMIT_PATTERNS).pattern,
+        _compile_patterns(
+            [p for p in BILLING_EXHAUSTION_PATTERNS if p not in UNAMBIGUOUS_BILLING_PATTERNS]
+        ).pattern,
+    ),
+    re.IGNORECASE,
+)
+
+
+# Shared keep-alive session so repeated calls to the same provider reuse
+# pooled connections instead of paying a TCP/TLS handshake per request.
+# urllib3 retries stay disabled: post_json implements its own backoff.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=64, max_retries=0))
+_SESSION.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=64, max_retries=0))
+
+
 _REQUEST_METADATA: ContextVar[Optional[dict[str, Any]]] = ContextVar(
     "llm_request_metadata",
     default=None,
@@ -194,6 +239,11 @@ def _set_request_metadata(
     )
 
 
+def get_session() -> requests.Session:
+    """Return the shared HTTP session used for provider requests."""
+    return _SESSION
+
+
 def get_current_request_metadata() -> Optional[dict[str, Any]]:
     """Return the latest request metadata captured by post_json."""
     metadata = _REQUEST_METADATA.get()
@@ -215,6 +265,42 @@ def build_timing_summary(
     }
 
 
+# Error bodies can be whole HTML pages; only the head is needed for
+# classification and for the message we surface.
+_ERROR_SNIPPET_CHARS = 500
+_ERROR_SNIPPET_BYTES = 2048
+
+
+def _error_snippet(response: requests.Response) -> str:
+    """Decode just the start of an error response body.
+
+    Unlike response.text this neither decodes the full body nor runs charset
+    detection when the server omits one.
+    """
+    head = response.content[:_ERROR_SNIPPET_BYTES]
+    try:
+        text = head.decode(response.encoding or "utf-8", errors="replace")
+    except LookupError:
+        # Unknown charset in Content-Type; requests falls back the same way
+        text = head.decode("utf-8", errors="replace")
+    return text[:_ERROR_SNIPPET_CHARS]
+
+
+def _decode_json_body(response: requests.Response) -> Any:
+    """Decode a successful response body, preferring orjson on the raw bytes.
+
+    orjson rejects some JSON the stdlib accepts (lone surrogate escapes such
+    as a truncated emoji, NaN/Infinity), so those bodies go through
+    response.json(). Raises ValueError if neither decoder accepts the body.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            pass
+    return response.json()
+
+
 def _is_unsupported_temperature_response(
     status_code: int,
     response_text: str,
@@ -224,11 +310,51 @@ def _is_unsupported_temperature_response(
     if "temperature" not in payload or status_code < 400:
         return False
 
-    text_lower = response_text.lower()
-    if "temperature" not in text_lower:
+    if "temperature" not in response_text.lower():
         return False
 
-    return any(pattern in text_lower for pattern in UNSUPPORTED_TEMPERATURE_PATTERNS)
+    return bool(_UNSUPPORTED_TEMPERATURE_RE.search(response_text))
+
+
+def _scan_error_text(response_text: str) -> set[str]:
+    """Return which marker classes appear in the text, in a single pass.
+
+    Classes: "unambiguous_billing", "rate_limit" and "billing" (ambiguous
+    billing patterns only).
+    """
+    found: set[str] = set()
+    for match in _ERROR_TEXT_RE.finditer(response_text):
+        # Every alternative is a named group, so one of them always matched
+        assert match.lastgroup is not None
+        found.add(match.lastgroup)
+        if len(found) == 3:
+            break
+    return found
+
+
+def _is_billing(status_code: int, found: set[str]) -> bool:
+    """Billing decision rule shared by the public classifiers."""
+    if status_code < 400:
+        return False
+    # Unambiguous billing markers always win, even alongside rate-limit text.
+    # Ambiguous billing patterns: rate-limit text takes precedence.
+    return "unambiguous_billing" in found or ("billing" in found and "rate_limit" not in found)
+
+
+def classify_error_response(
+    status_code: int, response_text: str
+) -> Literal["billing", "rate_limit", "other"]:
+    """Classify an HTTP error response from one scan of its text.
+
+    Billing exhaustion is checked first (see is_billing_exhaustion_response),
+    then rate limiting (see is_rate_limit_response).
+    """
+    found = _scan_error_text(response_text)
+    if _is_billing(status_code, found):
+        return "billing"
+    if status_code == 429 or "rate_limit" in found:
+        return "rate_limit"
+    return "other"
 
 
 def is_rate_limit_response(status_code: int, response_text: str) -> bool:
@@ -236,8 +362,7 @@ def is_rate_limit_response(status_code: int, response_text: str) -> bool:
     if status_code == 429:
         return True
     # Some providers return 400/503 with rate limit messages
-    text_lower = response_text.lower()
-    return any(pattern in text_lower for pattern in RATE_LIMIT_PATTERNS)
+    return "rate_limit" in _scan_error_text(response_text)
 
 
 def is_billing_exhaustion_response(status_code: int, response_text: str) -> bool:
@@ -253,18 +378,73 @@ def is_billing_exhaustion_response(status_code: int, response_text: str) -> bool
     """
     if status_code < 400:
         return False
+    return _is_billing(status_code, _scan_error_text(response_text))
 
-    text_lower = response_text.lower()
 
-    # Unambiguous billing markers always win, even alongside rate-limit text.
-    if any(pattern in text_lower for pattern in UNAMBIGUOUS_BILLING_PATTERNS):
-        return True
+# OpenAI-style reset durations, e.g. "1s", "6m0s", "250ms", "1h2m3.5s"
+_RESET_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_RESET_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
 
-    # Ambiguous billing patterns: rate-limit text takes precedence.
-    if any(pattern in text_lower for pattern in RATE_LIMIT_PATTERNS):
-        return False
 
-    return any(pattern in text_lower for pattern in BILLING_EXHAUSTION_PATTERNS)
+def _parse_reset_duration(value: str) -> Optional[float]:
+    """Parse an x-ratelimit-reset-* duration into seconds."""
+    parts = _RESET_DURATION_RE.findall(value.strip())
+    if not parts:
+        return None
+    return sum(float(amount) * _RESET_DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """Return the wait (seconds) a rate-limited response advertises, if any.
+
+    Honors Retry-After as either delta-seconds or an HTTP-date, then falls back
+    to OpenAI-style x-ratelimit-reset-requests/-tokens durations (taking the
+    longer of the two, since either limit may be the one that was hit).
+    """
+    retry_after = headers.get("Retry-After")
+    if retry_after:
+        retry_after = retry_after.strip()
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            retry_at = None
+        if retry_at is not None:
+            if retry_at.tzinfo is None:
+                retry_at = retry_at.replace(tzinfo=timezone.utc)
+            return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    parsed = (
+        _parse_reset_duration(headers[name])
+        for name in ("x-ratelimit-reset-requests", "x-ratelimit-reset-tokens")
+        if headers.get(name)
+    )
+    resets: list[float] = [reset for reset in parsed if reset is not None]
+    return max(resets) if resets else None
+
+
+def _rate_limit_sleep_seconds(headers: Mapping[str, str], attempt: int) -> float:
+    """Pick the sleep before rate-limit retry number `attempt` (0-based).
+
+    Uses the provider's advertised wait when present, otherwise the static
+    RATE_LIMIT_BACKOFF_SECONDS table. Jitter spreads out workers sharing a
+    quota; an advertised wait is only ever stretched, never shortened. Waits
+    below RETRY_BACKOFF_SECONDS (e.g. "Retry-After: 0") are raised to it so
+    they cannot burn the retry budget in immediate retries.
+    """
+    advertised = parse_retry_after(headers)
+    if advertised is not None:
+        sleep_for = max(advertised, RETRY_BACKOFF_SECONDS) * random.uniform(
+            1.0, 1.0 + RATE_LIMIT_JITTER
+        )
+    else:
+        sleep_for = RATE_LIMIT_BACKOFF_SECONDS[attempt] * random.uniform(
+            1.0 - RATE_LIMIT_JITTER, 1.0 + RATE_LIMIT_JITTER
+        )
+    return min(sleep_for, MAX_RATE_LIMIT_BACKOFF_SECONDS)
 
 
 def raise_if_empty_content(
@@ -315,6 +495,7 @@ def post_json(
     payload: dict,
     *,
     timeout: int = DEFAULT_TIMEOUT,
+    idempotency_key: Optional[str] = None,
 ) -> dict:
     """Make a POST request with JSON body and retry logic.
 
@@ -325,7 +506,20 @@ def post_json(
 
     For ambiguous 429s without billing markers, we default to retryable
     rate-limit handling to avoid failing prematurely on transient throttling.
+
+    Timeouts, connection errors and 5xx responses (other than rate limits)
+    feed a per-(host, model) circuit breaker; while it is open, calls fail
+    immediately with a retryable SERVER_ERROR instead of waiting on a
+    provider that is down.
+
+    When idempotency_key is given it is sent as an Idempotency-Key header on
+    every attempt, so a retry after a timeout cannot be billed twice by
+    providers that dedupe on it.
     """
+    if idempotency_key is not None:
+        headers = {**headers, "Idempotency-Key": idempotency_key}
+
+    breaker = get_circuit_breaker(url, payload)
     last_exc: Optional[Exception] = None
     rate_limit_attempts = 0
     network_attempts = 0
@@ -335,9 +529,17 @@ def post_json(
     max_total_attempts = MAX_HTTP_RETRIES + MAX_RATE_LIMIT_RETRIES
 
     while network_attempts < MAX_HTTP_RETRIES and rate_limit_attempts <= MAX_RATE_LIMIT_RETRIES:
+        if not breaker.allow_request():
+            raise LLMError(
+                message=f"Circuit open for {urlparse(url).netloc}: provider is failing, not sending request",
+                code=ErrorCode.SERVER_ERROR,
+                details=str(last_exc) if last_exc else None,
+            )
+
         try:
-            payload_for_hash = _build_payload_for_hash(payload)
-            log.debug("Raw API Request", url=url, payload=json.dumps(payload_for_hash, sort_keys=True))
+            if log.is_enabled("debug"):
+                payload_for_hash = _build_payload_for_hash(payload)
+                log.debug("Raw API Request", url=url, payload=json.dumps(payload_for_hash, sort_keys=True))
 
             _set_request_metadata(
                 payload,
@@ -347,10 +549,12 @@ def post_json(
                     retried_without_temperature=retried_without_temperature,
                 ),
             )
-            response = requests.post(url, headers=headers, json=payload, timeout=timeout)
+            response = _SESSION.post(url, headers=headers, json=payload, timeout=timeout)
+            if response.status_code < 500:
+                breaker.record_success()
 
             if response.status_code >= 400:
-                snippet = response.text[:500]
+                snippet = _error_snippet(response)
 
                 if (
                     not retried_without_temperature
@@ -366,8 +570,15 @@ def post_json(
                     _set_request_metadata(payload, adapter_mode="unsupported_param_retry")
                     continue
 
+                error_class = classify_error_response(response.status_code, snippet)
+
+                # A 5xx that is really throttling has its own backoff below; counting
+                # it would let one rate-limited call open the breaker for everyone
+                if response.status_code >= 500 and error_class != "rate_limit":
+                    breaker.record_failure()
+
                 # Billing/quota exhaustion should fail fast (non-retryable).
-                if is_billing_exhaustion_response(response.status_code, snippet):
+                if error_class == "billing":
                     # Reuse AUTH_ERROR because it is already modeled as
                     # non-retryable and indicates user action is required.
                     raise LLMError(
@@ -378,9 +589,9 @@ def post_json(
                     )
 
                 # Check if this is a rate limit response
-                if is_rate_limit_response(response.status_code, snippet):
+                if error_class == "rate_limit":
                     if rate_limit_attempts < MAX_RATE_LIMIT_RETRIES:
-                        sleep_for = RATE_LIMIT_BACKOFF_SECONDS[rate_limit_attempts]
+                        sleep_for = _rate_limit_sleep_seconds(response.headers, rate_limit_attempts)
                         log.warn(
                             "Rate limited, retrying with backoff",
                             attempt=rate_limit_attempts + 1,
@@ -414,7 +625,7 @@ def post_json(
                         retried_without_temperature=retried_without_temperature,
                     ),
                 )
-                return response.json()
+                return _decode_json_body(response)
             except ValueError as exc:
                 raise LLMError(
                     message="Failed to decode JSON response",
@@ -423,6 +634,7 @@ def post_json(
                 )
 
         except requests.Timeout as exc:
+            breaker.record_failure()
             last_exc = exc
             network_attempts += 1
             if network_attempts < MAX_HTTP_RETRIES:
@@ -437,6 +649,7 @@ def post_json(
             )
 
         except requests.ConnectionError as exc:
+            breaker.record_failure()
             last_exc = exc
             network_attempts += 1
             if network_attempts < MAX_HTTP_RETRIES:
@@ -451,6 +664,7 @@ def post_json(
             )
 
         except requests.RequestException as exc:
+            breaker.record_failure()
             raise LLMError(
                 message=f"Request error: {exc}",
                 code=ErrorCode.NETWORK_ERROR,
@@ -0,0 +1,79 @@
+"""
+Per-provider circuit breakers for LLM HTTP requests.
+"""
+
+import threading
+import time
+from typing import Any, Optional
+from urllib.parse import urlparse
+
+from .constants import (
+    CIRCUIT_BREAKER_COOLDOWN_SECONDS,
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+)
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one provider endpoint.
+
+    CLOSED: requests flow normally. After `failure_threshold` consecutive
+    failures it goes OPEN and rejects requests until `cooldown_seconds` have
+    passed, then HALF_OPEN admits a single probe: success closes the breaker,
+    failure re-opens it for another cooldown.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, cooldown_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be sent now."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.cooldown_seconds:
+                self.state = self.HALF_OPEN
+                return True
+            # OPEN within cooldown, or HALF_OPEN with the probe still in flight
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+_BREAKERS: dict[tuple[str, Optional[str]], CircuitBreaker] = {}
+_BREAKERS_LOCK = threading.Lock()
+
+
+def get_circuit_breaker(url: str, payload: dict[str, Any]) -> CircuitBreaker:
+    """Return the process-wide breaker for this request's (host, model)."""
+    key = (urlparse(url).netloc, payload.get("model"))
+    with _BREAKERS_LOCK:
+        breaker = _BREAKERS.get(key)
+        if breaker is None:
+            breaker = CircuitBreaker(CIRCUIT_BREAKER_FAILURE_THRESHOLD, CIRCUIT_BREAKER_COOLDOWN_SECONDS)
+            _BREAKERS[key] = breaker
+        return breaker
+
+
+def reset_circuit_breakers() -> None:
+    """Forget all breaker state (used by tests)."""
+    with _BREAKERS_LOCK:
+        _BREAKERS.clear()
@@ -2,6 +2,7 @@
 Constants and configuration for LLM adapters.
 """
 
+import os
 from typing import Optional
 
 # HTTP configuration
@@ -12,6 +13,13 @@ RETRY_BACKOFF_SECONDS = 2.0
 # Rate limit retry configuration
 MAX_RATE_LIMIT_RETRIES = 4
 RATE_LIMIT_BACKOFF_SECONDS = [30, 60, 90, 120]  # Exponential backoff for 429 responses
+MAX_RATE_LIMIT_BACKOFF_SECONDS = 300  # Upper bound on any single rate-limit sleep
+RATE_LIMIT_JITTER = 0.2  # +/- fraction applied to rate-limit sleeps to spread out retries
+
+# Circuit breaker: after this many consecutive timeouts/connection errors/5xx
+# for one (host, model), fail fast until the cooldown elapses
+CIRCUIT_BREAKER_FAILURE_THRESHOLD = int(os.getenv("LLM_CIRCUIT_BREAKER_FAILURES", "5"))
+CIRCUIT_BREAKER_COOLDOWN_SECONDS = float(os.getenv("LLM_CIRCUIT_BREAKER_COOLDOWN_SECONDS", "30"))
 
 # Provider detection patterns
 PROVIDER_PATTERNS: dict[str, list[str]] = {
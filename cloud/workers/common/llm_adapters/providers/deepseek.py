@@ -6,13 +6,20 @@ from dataclasses import dataclass
 import json
 import time
 from typing import Any, Generator, Optional
+import uuid
 
 import requests
 
 from ...config import get_config
 from ...errors import ErrorCode, LLMError
 from ...logging import get_logger
-from ..base import BaseLLMAdapter, build_timing_summary, post_json, raise_if_empty_content
+from ..base import (
+    BaseLLMAdapter,
+    build_timing_summary,
+    get_session,
+    post_json,
+    raise_if_empty_content,
+)
 from ..config_utils import get_config_value, resolve_max_tokens, resolve_temperature
 from ..constants import DEFAULT_TIMEOUT, normalize_finish_reason
 from ..types import LLMResponse, StreamChunk
@@ -106,7 +113,13 @@ class DeepSeekAdapter(BaseLLMAdapter):
             timeout=effective_timeout,
         )
         request_started_at = time.perf_counter()
-        data = post_json(self.base_url, headers, payload, timeout=effective_timeout)
+        data = post_json(
+            self.base_url,
+            headers,
+            payload,
+            timeout=effective_timeout,
+            idempotency_key=uuid.uuid4().hex,
+        )
         request_finished_at = time.perf_counter()
 
         try:
@@ -217,7 +230,7 @@ class DeepSeekAdapter(BaseLLMAdapter):
         log.debug("Starting DeepSeek streaming", model=model, max_tokens=resolved_max_tokens)
 
         try:
-            response = requests.post(
+            response = get_session().post(
                 self.base_url,
                 headers=headers,
                 json=payload,
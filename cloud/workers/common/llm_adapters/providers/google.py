@@ -5,6 +5,7 @@ Google Gemini API adapter.
 from dataclasses import dataclass
 import time
 from typing import Any, Optional
+import uuid
 
 from ...config import get_config
 from ...errors import ErrorCode, LLMError
@@ -118,7 +119,13 @@ class GeminiAdapter(BaseLLMAdapter):
         effective_timeout = timeout if timeout is not None else self.timeout
         log.debug("Calling Gemini API", model=model, max_tokens=resolved_max_tokens)
         request_started_at = time.perf_counter()
-        data = post_json(url, headers, payload, timeout=effective_timeout)
+        data = post_json(
+            url,
+            headers,
+            payload,
+            timeout=effective_timeout,
+            idempotency_key=uuid.uuid4().hex,
+        )
         request_finished_at = time.perf_counter()
 
         try:
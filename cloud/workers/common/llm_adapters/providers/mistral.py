@@ -5,6 +5,7 @@ Mistral API adapter (OpenAI-compatible).
 from dataclasses import dataclass
 import time
 from typing import Any, Optional
+import uuid
 
 from ...config import get_config
 from ...errors import ErrorCode, LLMError
@@ -83,7 +84,13 @@ class MistralAdapter(BaseLLMAdapter):
 
         log.debug("Calling Mistral API", model=model, max_tokens=resolved_max_tokens)
         request_started_at = time.perf_counter()
-        data = post_json(self.base_url, headers, payload, timeout=effective_timeout)
+        data = post_json(
+            self.base_url,
+            headers,
+            payload,
+            timeout=effective_timeout,
+            idempotency_key=uuid.uuid4().hex,
+        )
         request_finished_at = time.perf_counter()
 
         try:
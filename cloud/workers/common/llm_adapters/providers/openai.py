@@ -5,6 +5,7 @@ OpenAI Chat Completions API adapter.
 from dataclasses import dataclass
 import time
 from typing import Any, Optional
+import uuid
 
 from ...config import get_config
 from ...errors import ErrorCode, LLMError
@@ -104,7 +105,13 @@ class OpenAIAdapter(BaseLLMAdapter):
             max_tokens=resolved_max_tokens,
         )
         request_started_at = time.perf_counter()
-        data = post_json(self.base_url, headers, payload, timeout=effective_timeout)
+        data = post_json(
+            self.base_url,
+            headers,
+            payload,
+            timeout=effective_timeout,
+            idempotency_key=uuid.uuid4().hex,
+        )
         request_finished_at = time.perf_counter()
 
         try:
@@ -6,11 +6,19 @@ Matches the structured logging format expected by the TypeScript orchestrator.
 """
 
 import json
+import os
 import sys
 import time
 from dataclasses import dataclass, field
 from typing import Any, Optional
 
+# Level ordering matches pino, which the TypeScript orchestrator uses
+LEVELS = {"trace": 10, "debug": 20, "info": 30, "warn": 40, "error": 50}
+
+# Records below this level are dropped before they are built. Defaults to
+# trace so every record is emitted unless PYTHON_WORKER_LOG_LEVEL is set.
+_MIN_LEVEL = LEVELS.get(os.getenv("PYTHON_WORKER_LOG_LEVEL", "trace").lower(), LEVELS["trace"])
+
 
 @dataclass
 class Logger:
@@ -24,8 +32,15 @@ class Logger:
         new_extra = {**self._extra, **extra}
         return Logger(context=self.context, _extra=new_extra)
 
+    def is_enabled(self, level: str) -> bool:
+        """Return True if records at the given level will be emitted."""
+        return LEVELS[level] >= _MIN_LEVEL
+
     def _log(self, level: str, message: str, **kwargs: Any) -> None:
         """Output a structured log entry to stderr."""
+        if LEVELS[level] < _MIN_LEVEL:
+            return
+
         entry = {
             "level": level,
             "time": int(time.time() * 1000),  # Unix timestamp in ms
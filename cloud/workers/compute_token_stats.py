@@ -64,10 +64,12 @@ Output format:
 """
 
 import json
-import sys
 import time
-from typing import Any
+from typing import Any, Optional, Union
 
+import numpy as np
+
+from common import json_io
 from common.errors import ErrorCode, ValidationError
 from common.logging import get_logger
 from common.validation import require_field, require_list
@@ -77,6 +79,9 @@ log = get_logger("compute_token_stats")
 # EMA weight for new data (0.3 = 30% weight on new data)
 EMA_ALPHA = 0.3
 
+# Below this many probes, plain Python aggregation beats NumPy setup cost
+NUMPY_MIN_PROBES = 1000
+
 
 def validate_input(data: dict[str, Any]) -> None:
     """Validate compute token stats input."""
@@ -111,8 +116,28 @@ def compute_new_average(
     if len(new_values) == 0:
         return old_avg, old_count
 
-    new_avg = sum(new_values) / len(new_values)
-    new_count = len(new_values)
+    return combine_averages(
+        old_avg, old_count, sum(new_values) / len(new_values), len(new_values), alpha
+    )
+
+
+def combine_averages(
+    old_avg: float,
+    old_count: int,
+    new_avg: float,
+    new_count: int,
+    alpha: float = EMA_ALPHA,
+) -> tuple[float, int]:
+    """
+    Fold a batch's mean into the running average using EMA.
+
+    Same as compute_new_average, but takes the batch as (mean, count).
+
+    Returns:
+        Tuple of (new_average, new_sample_count)
+    """
+    if new_count == 0:
+        return old_avg, old_count
 
     if old_count == 0:
         # First data point - just use new average
@@ -140,32 +165,95 @@ def group_probes_by_model(
     grouped: dict[str, dict[str, list[int]]] = {}
 
     for probe in probe_results:
-        model_id = probe.get("modelId")
-        input_tokens = probe.get("inputTokens")
-        output_tokens = probe.get("outputTokens")
-
-        # Skip probes with missing data
-        if not model_id:
-            continue
-        if input_tokens is None or output_tokens is None:
-            continue
-        if not isinstance(input_tokens, (int, float)) or not isinstance(
-            output_tokens, (int, float)
-        ):
+        row = _token_row(probe)
+        if row is None:
             continue
+        model_id, input_tokens, output_tokens = row
 
-        if model_id not in grouped:
-            grouped[model_id] = {"input": [], "output": []}
+        # One dict lookup per probe instead of three
+        bucket = grouped.get(model_id)
+        if bucket is None:
+            bucket = grouped[model_id] = {"input": [], "output": []}
 
-        grouped[model_id]["input"].append(int(input_tokens))
-        grouped[model_id]["output"].append(int(output_tokens))
+        bucket["input"].append(input_tokens)
+        bucket["output"].append(output_tokens)
 
     return grouped
 
 
+def _token_row(probe: dict[str, Any]) -> Optional[tuple[str, int, int]]:
+    """Return (modelId, inputTokens, outputTokens) for a usable probe, else None."""
+    model_id = probe.get("modelId")
+    input_tokens = probe.get("inputTokens")
+    output_tokens = probe.get("outputTokens")
+
+    # Skip probes with missing data
+    if not model_id:
+        return None
+    if input_tokens is None or output_tokens is None:
+        return None
+    if not isinstance(input_tokens, (int, float)) or not isinstance(
+        output_tokens, (int, float)
+    ):
+        return None
+
+    return model_id, int(input_tokens), int(output_tokens)
+
+
+def summarize_probes_by_model(
+    probe_results: list[dict[str, Any]],
+) -> dict[str, tuple[int, float, float]]:
+    """
+    Aggregate probe token counts per model.
+
+    Large batches are reduced with np.bincount over integer model codes
+    instead of building per-model Python lists.
+
+    Args:
+        probe_results: List of probe result records
+
+    Returns:
+        Dict mapping modelId to (probe count, mean input tokens, mean output tokens),
+        in order of each model's first valid probe
+    """
+    if len(probe_results) < NUMPY_MIN_PROBES:
+        return {
+            model_id: (
+                len(tokens["input"]),
+                sum(tokens["input"]) / len(tokens["input"]),
+                sum(tokens["output"]) / len(tokens["output"]),
+            )
+            for model_id, tokens in group_probes_by_model(probe_results).items()
+        }
+
+    rows = [row for row in map(_token_row, probe_results) if row is not None]
+    if not rows:
+        return {}
+
+    # Model codes in first-seen order; token sums stay exact in float64
+    model_codes: dict[str, int] = {}
+    codes = np.fromiter(
+        (model_codes.setdefault(row[0], len(model_codes)) for row in rows),
+        dtype=np.intp,
+        count=len(rows),
+    )
+    input_tokens = np.fromiter((row[1] for row in rows), dtype=np.float64, count=len(rows))
+    output_tokens = np.fromiter((row[2] for row in rows), dtype=np.float64, count=len(rows))
+
+    counts = np.bincount(codes)
+    input_means = np.bincount(codes, weights=input_tokens) / counts
+    output_means = np.bincount(codes, weights=output_tokens) / counts
+
+    return {
+        model_id: (int(counts[i]), float(input_means[i]), float(output_means[i]))
+        for model_id, i in model_codes.items()
+    }
+
+
 def compute_stats(
     probe_results: list[dict[str, Any]],
     existing_stats: dict[str, dict[str, Any]],
+    summary: dict[str, tuple[int, float, float]] | None = None,
 ) -> dict[str, dict[str, Any]]:
     """
     Compute new token statistics for each model.
@@ -173,24 +261,24 @@ def compute_stats(
     Args:
         probe_results: List of probe results with token data
         existing_stats: Map of modelId to existing statistics
+        summary: Optional output of summarize_probes_by_model(probe_results),
+            so callers computing several stats from one batch aggregate it once
 
     Returns:
         Dict mapping modelId to updated statistics
     """
-    # Group probes by model
-    grouped = group_probes_by_model(probe_results)
+    # Aggregate probes by model
+    if summary is None:
+        summary = summarize_probes_by_model(probe_results)
 
-    if len(grouped) == 0:
+    if len(summary) == 0:
         log.warn("No valid probe results with token data")
         return {}
 
     # Compute new stats for each model
     result: dict[str, dict[str, Any]] = {}
 
-    for model_id, tokens in grouped.items():
-        input_tokens = tokens["input"]
-        output_tokens = tokens["output"]
-
+    for model_id, (probe_count, batch_avg_input, batch_avg_output) in summary.items():
         # Get existing stats or defaults
         existing = existing_stats.get(model_id, {})
         old_avg_input = existing.get("avgInputTokens", 0)
@@ -198,9 +286,9 @@ def compute_stats(
         old_count = existing.get("sampleCount", 0)
 
         # Compute new averages using EMA
-        new_avg_input, _ = compute_new_average(old_avg_input, old_count, input_tokens)
-        new_avg_output, new_count = compute_new_average(
-            old_avg_output, old_count, output_tokens
+        new_avg_input, _ = combine_averages(old_avg_input, old_count, batch_avg_input, probe_count)
+        new_avg_output, new_count = combine_averages(
+            old_avg_output, old_count, batch_avg_output, probe_count
         )
 
         result[model_id] = {
@@ -209,30 +297,30 @@ def compute_stats(
             "sampleCount": new_count,
         }
 
-        log.debug(
-            f"Model {model_id}: input {old_avg_input:.1f} -> {new_avg_input:.1f}, "
-            f"output {old_avg_output:.1f} -> {new_avg_output:.1f}, "
-            f"samples {old_count} -> {new_count}",
-            modelId=model_id,
-            oldAvgInput=old_avg_input,
-            newAvgInput=new_avg_input,
-            oldAvgOutput=old_avg_output,
-            newAvgOutput=new_avg_output,
-        )
+        if log.is_enabled("debug"):
+            log.debug(
+                "Model stats updated",
+                modelId=model_id,
+                oldAvgInput=old_avg_input,
+                newAvgInput=new_avg_input,
+                oldAvgOutput=old_avg_output,
+                newAvgOutput=new_avg_output,
+                oldCount=old_count,
+                newCount=new_count,
+            )
 
     return result
 
 
-def main() -> None:
-    """Main entry point for compute_token_stats worker."""
+def process_input(raw_input: Union[str, bytes]) -> dict[str, Any]:
+    """Run one compute_token_stats job from its raw JSON input and return the output."""
     start_time = time.time()
 
     try:
-        # Read input from stdin
         try:
-            input_data = json.load(sys.stdin)
+            input_data = json_io.loads(raw_input)
         except json.JSONDecodeError as err:
-            output = {
+            return {
                 "success": False,
                 "error": {
                     "message": f"Invalid JSON input: {err}",
@@ -240,8 +328,6 @@ def main() -> None:
                     "retryable": False,
                 },
             }
-            print(json.dumps(output))
-            return
 
         run_id = input_data.get("runId", "unknown")
         definition_id = input_data.get("definitionId", "unknown")
@@ -251,16 +337,14 @@ def main() -> None:
         try:
             validate_input(input_data)
         except ValidationError as err:
-            output = {"success": False, "error": err.to_dict()}
-            print(json.dumps(output))
-            return
+            return {"success": False, "error": err.to_dict()}
 
         probe_results = input_data["probeResults"]
         existing_stats = input_data.get("existingStats", {})
         existing_definition_stats = input_data.get("existingDefinitionStats", {})
 
         log.info(
-            f"Computing stats from {len(probe_results)} probe results",
+            "Computing stats from probe results",
             runId=run_id,
             definitionId=definition_id,
             probeCount=len(probe_results),
@@ -268,23 +352,22 @@ def main() -> None:
             existingDefModels=len(existing_definition_stats),
         )
 
+        # Aggregate once; both stats and the summary use the same per-model counts
+        probe_summary = summarize_probes_by_model(probe_results)
+
         # Compute global statistics (using existing global stats)
-        new_global_stats = compute_stats(probe_results, existing_stats)
+        new_global_stats = compute_stats(probe_results, existing_stats, probe_summary)
 
         # Compute definition-specific statistics (using existing definition stats)
-        new_definition_stats = compute_stats(probe_results, existing_definition_stats)
+        new_definition_stats = compute_stats(probe_results, existing_definition_stats, probe_summary)
 
         # Calculate summary
-        total_probes = sum(
-            len(group_probes_by_model(probe_results).get(m, {}).get("input", []))
-            for m in new_global_stats.keys()
-        )
+        total_probes = sum(probe_summary[m][0] for m in new_global_stats)
 
         duration_ms = int((time.time() - start_time) * 1000)
 
         log.info(
-            f"Stats computation complete: {len(new_global_stats)} models updated (global), "
-            f"{len(new_definition_stats)} models updated (definition)",
+            "Stats computation complete",
             runId=run_id,
             definitionId=definition_id,
             globalModelsUpdated=len(new_global_stats),
@@ -293,8 +376,7 @@ def main() -> None:
             durationMs=duration_ms,
         )
 
-        # Output success result
-        output = {
+        return {
             "success": True,
             "stats": new_global_stats,
             "definitionStats": new_definition_stats,
@@ -304,11 +386,10 @@ def main() -> None:
                 "durationMs": duration_ms,
             },
         }
-        print(json.dumps(output))
 
     except Exception as e:
         log.error(f"Unexpected error: {str(e)}", err={"type": type(e).__name__, "message": str(e)})
-        output = {
+        return {
             "success": False,
             "error": {
                 "message": str(e),
@@ -316,7 +397,11 @@ def main() -> None:
                 "retryable": True,
             },
         }
-        print(json.dumps(output))
+
+
+def main() -> None:
+    """Main entry point for compute_token_stats worker."""
+    json_io.write_stdout(process_input(json_io.read_stdin()))
 
 
 if __name__ == "__main__":
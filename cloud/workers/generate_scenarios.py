@@ -9,13 +9,13 @@ Protocol:
 """
 
 import itertools
-import json
+import math
 import random
 import re
-import sys
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Pattern, Tuple, Union
 
+from common import json_io
 from common.errors import ErrorCode, ValidationError, classify_exception
 from common.logging import get_logger
 from common.validation import require_dict, require_field
@@ -36,6 +36,39 @@ class Dimension:
     """A scenario dimension with levels."""
     name: str
     levels: List[DimensionLevel] = field(default_factory=list)
+    levels_by_score: Dict[int, DimensionLevel] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # First level wins on duplicate scores, matching a linear scan of levels
+        self.levels_by_score = {}
+        for level in self.levels:
+            self.levels_by_score.setdefault(level.score, level)
+
+
+@dataclass
+class TemplatePatterns:
+    """Placeholder regexes for each dimension, compiled once per generation run."""
+    scale: Dict[str, Pattern[str]]
+    score: Dict[str, Pattern[str]]
+    standard: Dict[str, Pattern[str]]
+
+
+def compile_template_patterns(dimension_names: List[str]) -> TemplatePatterns:
+    """Compile the three substitution patterns used by fill_template per dimension."""
+    scale = {}
+    score = {}
+    standard = {}
+    for dim_name in dimension_names:
+        escaped = re.escape(dim_name)
+        # Pattern for "5 - [DimName]" or "1. [DimName]"
+        # Group 2: The Score (number); Group 3: The separator and prefix text
+        scale[dim_name] = re.compile(
+            r'(^|\n)\s*(\d+)(\s*[-.)]\s*.*?)\[(' + escaped + r')\]',
+            re.IGNORECASE
+        )
+        score[dim_name] = re.compile(r'\[' + escaped + r'_Score(\d+)\]', re.IGNORECASE)
+        standard[dim_name] = re.compile(r'\[' + escaped + r'\]', re.IGNORECASE)
+    return TemplatePatterns(scale=scale, score=score, standard=standard)
 
 
 def parse_dimensions(raw_dimensions: List[Dict[str, Any]]) -> List[Dimension]:
@@ -72,25 +105,129 @@ def normalize_preamble(preamble: Optional[str]) -> Optional[str]:
     return preamble
 
 
-def get_option_for_level(level: DimensionLevel) -> str:
-    """Get a random option from the level, or label if no options."""
-    if level.options:
-        return random.choice(level.options)
+def get_option_for_level(level: DimensionLevel, rng: Optional[random.Random] = None) -> str:
+    """Get a random option from the level, or label if no options.
+
+    Uses `rng` when given (run_generation seeds one per definition) and the
+    module-level generator otherwise.
+    """
+    options = level.options
+    if len(options) == 1:
+        return options[0]
+    if options:
+        return (rng or random).choice(options)
     return level.label
 
 
-def get_specific_option(dim: Dimension, score: int) -> str:
+def get_specific_option(dim: Dimension, score: Union[int, str], rng: Optional[random.Random] = None) -> str:
     """Get option for a specific score in a dimension."""
-    for level in dim.levels:
-        if level.score == int(score):
-            return get_option_for_level(level)
+    level = dim.levels_by_score.get(int(score))
+    if level is not None:
+        return get_option_for_level(level, rng)
     return f"[{dim.name}_Score{score}]"  # Fallback if not found
 
 
+@dataclass
+class ScoreRef:
+    """Placeholder resolved to the option for a fixed score ("5 - [Dim]" or [Dim_Score5])."""
+    dim: Dimension
+    score: str
+
+
+@dataclass
+class DimRef:
+    """Placeholder resolved to the current combination's option ([Dim])."""
+    name: str
+
+
+TemplateNode = Union[str, ScoreRef, DimRef]
+
+
+def parse_template(
+    template: str,
+    dimensions_map: Dict[str, Dimension],
+    dim_names: List[str],
+    patterns: TemplatePatterns,
+) -> List[TemplateNode]:
+    """
+    Split a template into literal text and placeholder nodes.
+
+    Placeholders are located with the same patterns, in the same precedence,
+    as the three substitution passes described in fill_template: a bracket
+    claimed by an earlier pass is not matched again by a later one.
+    """
+    spans: List[Tuple[int, int, TemplateNode]] = []  # (start, end, node)
+
+    def claim(start: int, end: int, node: TemplateNode) -> None:
+        if not any(start < other_end and other_start < end for other_start, other_end, _ in spans):
+            spans.append((start, end, node))
+
+    # Pass 1: Context-Aware Substitution (Scale detection); group 4 is the name inside [..].
+    # The substitution also drops the whitespace between the line start and the number.
+    for dim_name, dim in dimensions_map.items():
+        for match in patterns.scale[dim_name].finditer(template):
+            if match.end(1) < match.start(2):
+                claim(match.end(1), match.start(2), "")
+            claim(match.start(4) - 1, match.end(4) + 1, ScoreRef(dim, match.group(2)))
+
+    # Pass 2: Explicit Score Substitution [DimName_ScoreX]
+    for dim_name, dim in dimensions_map.items():
+        for match in patterns.score[dim_name].finditer(template):
+            claim(match.start(), match.end(), ScoreRef(dim, match.group(1)))
+
+    # Pass 3: Standard Substitution [DimName]
+    for dim_name in dim_names:
+        for match in patterns.standard[dim_name].finditer(template):
+            claim(match.start(), match.end(), DimRef(dim_name))
+
+    nodes: List[TemplateNode] = []
+    position = 0
+    for start, end, node in sorted(spans, key=lambda span: span[0]):
+        if start > position:
+            nodes.append(template[position:start])
+        if node != "":
+            nodes.append(node)
+        position = end
+    if position < len(template):
+        nodes.append(template[position:])
+    return nodes
+
+
+def render_template(
+    nodes: List[TemplateNode],
+    combination: List[Dict[str, Any]],
+    rng: Optional[random.Random] = None,
+) -> str:
+    """Fill parsed template nodes for one combination of dimension levels."""
+    # Every [DimName] in a scenario uses the same option for the combination's level
+    options: Dict[str, str] = {}
+    for item in combination:
+        if item['name'] not in options:
+            options[item['name']] = get_option_for_level(item['level'], rng)
+
+    # Likewise every reference to one (dimension, score) reuses its first draw
+    score_options: Dict[Tuple[str, int], str] = {}
+
+    parts = []
+    for node in nodes:
+        if isinstance(node, str):
+            parts.append(node)
+        elif isinstance(node, DimRef):
+            parts.append(options[node.name])
+        else:
+            key = (node.dim.name, int(node.score))
+            if key not in score_options:
+                score_options[key] = get_specific_option(node.dim, node.score, rng)
+            parts.append(score_options[key])
+    return "".join(parts)
+
+
 def fill_template(
     template: str,
     combination: List[Dict[str, Any]],
-    dimensions_map: Dict[str, Dimension]
+    dimensions_map: Dict[str, Dimension],
+    patterns: Optional[TemplatePatterns] = None,
+    rng: Optional[random.Random] = None,
 ) -> str:
     """
     Replace template placeholders with dimension values.
@@ -99,57 +236,19 @@ def fill_template(
        by using the specific score's option.
     2. Explicit Score Substitution: Handles [DimName_ScoreX].
     3. Standard Substitution: Replaces [DimName] with the current combination's value.
-    """
-    result = template
 
-    # Pass 1: Context-Aware Substitution (Scale detection)
-    # Looks for lines starting with a number, followed by punctuation, then text containing [DimName]
-    # Regex: Start of line or newline, capture number, separator, content, [DimName]
-    # We iterate over dimensions to find them in the text
-    
-    for dim_name, dim in dimensions_map.items():
-        # Pattern for "5 - [DimName]" or "1. [DimName]"
-        # Group 1: The Score (number)
-        # Group 2: The separator and prefix text
-        pattern = re.compile(
-            r'(^|\n)\s*(\d+)(\s*[-.)]\s*.*?)\[(' + re.escape(dim_name) + r')\]',
-            re.IGNORECASE
+    Substituted options are inserted verbatim and are not rescanned for
+    placeholders. When filling many combinations of one template, parse it
+    once with parse_template and call render_template per combination.
+    """
+    if patterns is None:
+        patterns = compile_template_patterns(
+            list(dimensions_map) + [item['name'] for item in combination]
         )
-        
-        def replace_scale_match(match):
-            prefix = match.group(1)
-            score = match.group(2)
-            separator = match.group(3)
-            # dim_matched = match.group(4)
-            
-            # Find the option for this score
-            option = get_specific_option(dim, score)
-            
-            return f"{prefix}{score}{separator}{option}"
-
-        result = pattern.sub(replace_scale_match, result)
-    
-    # Pass 2: Explicit Score Substitution [DimName_ScoreX]
-    for dim_name, dim in dimensions_map.items():
-        pattern = re.compile(r'\[' + re.escape(dim_name) + r'_Score(\d+)\]', re.IGNORECASE)
-        
-        def replace_explicit_match(match):
-            score = match.group(1)
-            return get_specific_option(dim, score)
-            
-        result = pattern.sub(replace_explicit_match, result)
-
-    # Pass 3: Standard Substitution
-    for item in combination:
-        dim_name = item['name']
-        level = item['level']
-        option = get_option_for_level(level)
-        
-        # Replace [DimName] case-insensitive
-        pattern = re.compile(r'\[' + re.escape(dim_name) + r'\]', re.IGNORECASE)
-        result = pattern.sub(option, result)
-
-    return result
+    nodes = parse_template(
+        template, dimensions_map, [item['name'] for item in combination], patterns
+    )
+    return render_template(nodes, combination, rng)
 
 
 def generate_scenario_name(combination: List[Dict[str, Any]]) -> str:
@@ -189,27 +288,37 @@ def run_generation(data: Dict[str, Any]) -> Dict[str, Any]:
     # Parse dimensions
     dimensions = parse_dimensions(raw_dimensions)
     dimensions_map = {d.name: d for d in dimensions}
+    patterns = compile_template_patterns(list(dimensions_map))
+    # Locate placeholders once; each combination then only joins strings
+    template_nodes = parse_template(template, dimensions_map, [d.name for d in dimensions], patterns)
 
     # Generate all combinations (Cartesian product)
     # Each element in product is a tuple of levels corresponding to dimensions
     
     # Prepare lists of levels
-    levels_lists = []
+    levels_lists: List[List[Dict[str, Any]]] = []
     for dim in dimensions:
         # Store as dict to keep track of dimension name
         dim_levels = [{'name': dim.name, 'level': lvl} for lvl in dim.levels]
         levels_lists.append(dim_levels)
     
-    combinations = list(itertools.product(*levels_lists)) if levels_lists else [[]]
+    # Iterate the product lazily rather than materializing every combination;
+    # with no dimensions it yields a single empty combination
+    combinations = itertools.product(*levels_lists)
+    combination_count = math.prod(len(dim_levels) for dim_levels in levels_lists)
     
     log.info(
         "Generated dimension combinations",
-        combinationCount=len(combinations)
+        combinationCount=combination_count
     )
 
-    generated_scenarios = []
+    generated_scenarios: List[Optional[Dict[str, Any]]] = [None] * combination_count
+    # Option choices are seeded by the definition, so regenerating it is reproducible
+    rng = random.Random(definition_id)
+    # Same preamble for every scenario of this definition
+    preamble = normalize_preamble(content.get("preamble"))
     
-    for combo_tuple in combinations:
+    for index, combo_tuple in enumerate(combinations):
         # combo_tuple is a tuple of dicts: ({name: 'A', level: ...}, {name: 'B', level: ...})
         combo_list = list(combo_tuple)
         
@@ -219,19 +328,19 @@ def run_generation(data: Dict[str, Any]) -> Dict[str, Any]:
             dim_scores[item['name']] = item['level'].score
             
         # Fill template
-        prompt = fill_template(template, combo_list, dimensions_map)
+        prompt = render_template(template_nodes, combo_list, rng)
         
         # Build Name
         name = generate_scenario_name(combo_list)
         
-        generated_scenarios.append({
+        generated_scenarios[index] = {
             "name": name,
             "content": {
-                "preamble": normalize_preamble(content.get("preamble")),
+                "preamble": preamble,
                 "prompt": prompt,
                 "dimensions": dim_scores
             }
-        })
+        }
 
     return {
         "success": True,
@@ -249,25 +358,22 @@ def run_generation(data: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def main() -> None:
-    """Main entry point."""
+def process_input(raw_input: Union[str, bytes]) -> Dict[str, Any]:
+    """Run one generation job from its raw JSON input and return the output."""
     try:
-        input_data = sys.stdin.read()
-        if not input_data.strip():
-            print(json.dumps({
+        if not raw_input.strip():
+            return {
                 "success": False, 
                 "error": {"message": "No input provided", "code": ErrorCode.VALIDATION_ERROR.value}
-            }))
-            return
+            }
 
-        data = json.loads(input_data)
+        data = json_io.loads(raw_input)
         validate_input(data)
-        result = run_generation(data)
-        print(json.dumps(result))
+        return run_generation(data)
 
     except Exception as err:
         log.error("Unexpected error in generate_scenarios worker", err=err)
-        result = {
+        return {
             "success": False,
             "error": {
                 "message": str(err),
@@ -275,7 +381,11 @@ def main() -> None:
                 "retryable": False
             }
         }
-        print(json.dumps(result))
+
+
+def main() -> None:
+    """Main entry point."""
+    json_io.write_stdout(process_input(json_io.read_stdin()))
 
 
 if __name__ == "__main__":
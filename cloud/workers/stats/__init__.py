@@ -21,6 +21,7 @@ from stats.model_comparison import (
 from stats.dimension_impact import (
     compute_dimension_effects,
     compute_variance_explained,
+    compute_variance_explained_from_transcripts,
 )
 
 __all__ = [
@@ -36,4 +37,5 @@ __all__ = [
     # Dimension impact
     "compute_dimension_effects",
     "compute_variance_explained",
+    "compute_variance_explained_from_transcripts",
 ]
@@ -98,17 +98,56 @@ def compute_value_stats(
     )
 
 
-def compute_model_summary(scores: list[float]) -> ModelSummary:
+def compute_value_stats_batch(
+    prioritized: np.ndarray,
+    deprioritized: np.ndarray,
+    neutral: np.ndarray,
+) -> list[ValueStats]:
+    """
+    Compute value statistics for many values at once.
+
+    Equivalent to calling compute_value_stats on each aligned triple, with
+    the win rates computed in a single vectorized pass.
+
+    Args:
+        prioritized: Prioritized counts, one entry per value
+        deprioritized: Deprioritized counts, aligned with prioritized
+        neutral: Neutral counts, aligned with prioritized
+
+    Returns:
+        ValueStats for each value, in input order
+    """
+    totals = prioritized + deprioritized + neutral
+    win_rates = np.full(len(totals), 0.5)  # No data means neutral
+    np.divide(prioritized, totals, out=win_rates, where=totals != 0)
+
+    return [
+        ValueStats(
+            winRate=round(win_rate, 6),
+            count=ValueCounts(
+                prioritized=round(p, 6),
+                deprioritized=round(d, 6),
+                neutral=round(n, 6),
+            ),
+        )
+        for win_rate, p, d, n in zip(
+            win_rates.tolist(), prioritized.tolist(), deprioritized.tolist(), neutral.tolist()
+        )
+    ]
+
+
+def compute_model_summary(scores: list[float] | np.ndarray) -> ModelSummary:
     """
     Compute summary statistics for a model's overall scores.
 
     Args:
-        scores: List of score values
+        scores: Score values; a float64 array is used as-is without copying
 
     Returns:
         ModelSummary with mean, stdDev, min, max
     """
-    if not scores:
+    arr = np.asarray(scores, dtype=np.float64)
+    if arr.size == 0:
         return ModelSummary(
             mean=0.0,
             stdDev=0.0,
@@ -116,12 +155,11 @@ def compute_model_summary(scores: list[float]) -> ModelSummary:
             max=0.0,
         )
 
-    arr = np.array(scores)
     return ModelSummary(
-        mean=round(float(np.mean(arr)), 6),
-        stdDev=round(float(np.std(arr, ddof=1)) if len(arr) > 1 else 0.0, 6),
-        min=round(float(np.min(arr)), 6),
-        max=round(float(np.max(arr)), 6),
+        mean=round(float(arr.mean()), 6),
+        stdDev=round(float(arr.std(ddof=1)) if arr.size > 1 else 0.0, 6),
+        min=round(float(arr.min()), 6),
+        max=round(float(arr.max()), 6),
     )
 
 
@@ -187,108 +225,133 @@ def compute_visualization_data(
     )
 
 
+# Status -> column in the per-condition count table; any other status is neutral
+_STATUS_COLUMNS = {"prioritized": 0, "deprioritized": 1}
+_NEUTRAL_COLUMN = 2
+
+
 def aggregate_transcripts_by_model(
     transcripts: list[dict[str, Any]],
 ) -> dict[str, ModelStats]:
     """
     Aggregate transcript data into per-model statistics.
 
+    Each (model, scenario) condition contributes one unit of weight per value,
+    split across prioritized/deprioritized/neutral by its share of trials.
+
     Args:
         transcripts: List of transcript dicts with modelId, decision, values
 
     Returns:
         Dict mapping modelId to ModelStats
     """
-    # Group transcripts by model
-    by_model: dict[str, list[dict[str, Any]]] = {}
-    for t in transcripts:
-        model_id = t.get("modelId", "unknown")
-        if model_id not in by_model:
-            by_model[model_id] = []
-        by_model[model_id].append(t)
-
-    result: dict[str, ModelStats] = {}
-
-    for model_id, model_transcripts in by_model.items():
-        by_condition: dict[str, list[dict[str, Any]]] = {}
-        for transcript in model_transcripts:
-            scenario_id = transcript.get("scenarioId", "unknown")
-            if scenario_id not in by_condition:
-                by_condition[scenario_id] = []
-            by_condition[scenario_id].append(transcript)
-
-        accumulated_counts: dict[str, ValueCounts] = {}
-        condition_means: list[float] = []
-
-        for condition_transcripts in by_condition.values():
-            condition_value_counts: dict[str, ValueCounts] = {}
-            condition_scores: list[float] = []
-
-            for transcript in condition_transcripts:
-                summary = transcript.get("summary", {})
-                values_data = summary.get("values", {})
-
-                for value_id, status in values_data.items():
-                    if value_id not in condition_value_counts:
-                        condition_value_counts[value_id] = ValueCounts(
-                            prioritized=0.0,
-                            deprioritized=0.0,
-                            neutral=0.0,
-                        )
-
-                    if status == "prioritized":
-                        condition_value_counts[value_id]["prioritized"] += 1.0
-                    elif status == "deprioritized":
-                        condition_value_counts[value_id]["deprioritized"] += 1.0
-                    else:
-                        condition_value_counts[value_id]["neutral"] += 1.0
-
-                score = resolve_transcript_signed_distance(transcript)
-                if score is not None:
-                    condition_scores.append(float(score))
-
-            for value_id, counts in condition_value_counts.items():
-                total = counts["prioritized"] + counts["deprioritized"] + counts["neutral"]
-                if total <= 0:
-                    continue
-
-                if value_id not in accumulated_counts:
-                    accumulated_counts[value_id] = ValueCounts(
-                        prioritized=0.0,
-                        deprioritized=0.0,
-                        neutral=0.0,
-                    )
-
-                accumulated_counts[value_id]["prioritized"] = round(
-                    accumulated_counts[value_id]["prioritized"] + counts["prioritized"] / total,
-                    6,
-                )
-                accumulated_counts[value_id]["deprioritized"] = round(
-                    accumulated_counts[value_id]["deprioritized"] + counts["deprioritized"] / total,
-                    6,
-                )
-                accumulated_counts[value_id]["neutral"] = round(
-                    accumulated_counts[value_id]["neutral"] + counts["neutral"] / total,
-                    6,
-                )
+    # One pass flattens the transcripts into integer-coded columns: a row per
+    # (transcript, value) pair, plus per-condition score sums. Conditions are
+    # (model, scenario) pairs, coded in first-appearance order.
+    model_codes: dict[str, int] = {}
+    condition_codes: dict[tuple[int, str], int] = {}
+    value_codes: dict[str, int] = {}
+    sample_sizes: list[int] = []
+    condition_models: list[int] = []
+    condition_score_sums: list[float] = []
+    condition_score_counts: list[int] = []
+    row_conditions: list[int] = []
+    row_values: list[int] = []
+    row_statuses: list[int] = []
+
+    for transcript in transcripts:
+        model_id = transcript.get("modelId", "unknown")
+        model_code = model_codes.get(model_id)
+        if model_code is None:
+            model_code = model_codes[model_id] = len(model_codes)
+            sample_sizes.append(0)
+        sample_sizes[model_code] += 1
+
+        condition_key = (model_code, transcript.get("scenarioId", "unknown"))
+        condition_code = condition_codes.get(condition_key)
+        if condition_code is None:
+            condition_code = condition_codes[condition_key] = len(condition_codes)
+            condition_models.append(model_code)
+            condition_score_sums.append(0.0)
+            condition_score_counts.append(0)
+
+        summary = transcript.get("summary", {})
+        for value_id, status in summary.get("values", {}).items():
+            value_code = value_codes.get(value_id)
+            if value_code is None:
+                value_code = value_codes[value_id] = len(value_codes)
+            row_conditions.append(condition_code)
+            row_values.append(value_code)
+            row_statuses.append(
+                _STATUS_COLUMNS.get(status, _NEUTRAL_COLUMN) if isinstance(status, str) else _NEUTRAL_COLUMN
+            )
 
-            if condition_scores:
-                condition_means.append(float(np.mean(condition_scores)))
+        score = resolve_transcript_signed_distance(transcript)
+        if score is not None:
+            condition_score_sums[condition_code] += float(score)
+            condition_score_counts[condition_code] += 1
+
+    if not model_codes:
+        return {}
+
+    # Count statuses per (condition, value) cell in C, then turn each cell into
+    # its share of the condition's trials for that value
+    n_values = len(value_codes)
+    cells = np.asarray(row_conditions, dtype=np.int64) * n_values + np.asarray(row_values, dtype=np.int64)
+    counts = np.bincount(
+        cells * 3 + np.asarray(row_statuses, dtype=np.int64),
+        minlength=len(condition_codes) * n_values * 3,
+    ).reshape(-1, 3).astype(np.float64)
+    present_cells, first_rows = np.unique(cells, return_index=True)
+    cell_counts = counts[present_cells]
+    fractions = cell_counts / cell_counts.sum(axis=1, keepdims=True)
+
+    # Accumulate shares condition by condition, values in the order they first
+    # appear within each condition (this fixes the output key order)
+    cell_conditions = present_cells // n_values
+    order = np.lexsort((first_rows, cell_conditions))
+    value_ids = list(value_codes)
+    accumulated: list[dict[str, list[float]]] = [{} for _ in model_codes]
+    for condition_code, value_code, (prioritized, deprioritized, neutral) in zip(
+        cell_conditions[order].tolist(),
+        (present_cells[order] % n_values).tolist(),
+        fractions[order].tolist(),
+    ):
+        model_counts = accumulated[condition_models[condition_code]]
+        value_id = value_ids[value_code]
+        entry = model_counts.get(value_id)
+        if entry is None:
+            entry = model_counts[value_id] = [0.0, 0.0, 0.0]
+        entry[0] = round(entry[0] + prioritized, 6)
+        entry[1] = round(entry[1] + deprioritized, 6)
+        entry[2] = round(entry[2] + neutral, 6)
+
+    # Mean score of each condition that has any scored trial, grouped by model
+    condition_model_array = np.asarray(condition_models, dtype=np.int64)
+    condition_counts = np.bincount(condition_model_array, minlength=len(model_codes))
+    score_counts = np.asarray(condition_score_counts, dtype=np.float64)
+    scored = score_counts > 0
+    scored_means = np.asarray(condition_score_sums, dtype=np.float64)[scored] / score_counts[scored]
+    scored_models = condition_model_array[scored]
+    # Split the condition means into one array per model with a single stable
+    # sort, rather than masking the whole array once per model
+    by_model = np.argsort(scored_models, kind="stable")
+    model_scores = np.split(
+        scored_means[by_model],
+        np.cumsum(np.bincount(scored_models, minlength=len(model_codes)))[:-1],
+    )
 
-        # Compute value stats
-        values: dict[str, ValueStats] = {}
-        for value_id, counts in accumulated_counts.items():
-            values[value_id] = compute_value_stats(
-                counts["prioritized"],
-                counts["deprioritized"],
-                counts["neutral"],
-            )
+    result: dict[str, ModelStats] = {}
+    for model_id, model_code in model_codes.items():
+        model_counts = accumulated[model_code]
+        table = np.array(list(model_counts.values()), dtype=np.float64).reshape(-1, 3)
+        value_stats = compute_value_stats_batch(table[:, 0], table[:, 1], table[:, 2])
 
         result[model_id] = ModelStats(
-            sampleSize=len(model_transcripts),
-            conditionCount=len(by_condition),
-            values=values,
-            overall=compute_model_summary(condition_means),
+            sampleSize=sample_sizes[model_code],
+            conditionCount=int(condition_counts[model_code]),
+            values=dict(zip(model_counts, value_stats)),
+            overall=compute_model_summary(model_scores[model_code]),
         )
 
     return result
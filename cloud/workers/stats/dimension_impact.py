@@ -8,7 +8,7 @@ impact on AI model decisions using ANOVA/Kruskal-Wallis tests.
 from typing import Any, TypedDict
 
 import numpy as np
-from scipy import stats
+from scipy import special
 
 from stats.decision_model import resolve_transcript_signed_distance
 
@@ -59,71 +59,123 @@ def compute_eta_squared(
     if len(groups) < 2:
         return 0.0
 
-    grand_mean = np.mean(all_values)
-    ss_total = sum((x - grand_mean) ** 2 for x in all_values)
+    values = np.asarray(all_values, dtype=np.float64)
+    grand_mean = values.mean()
+    deviations = values - grand_mean
+    ss_total = float(np.dot(deviations, deviations))
 
     if ss_total == 0:
         return 0.0
 
-    # SS between groups
-    ss_between = sum(
-        len(g) * (np.mean(g) - grand_mean) ** 2
-        for g in groups
-    )
+    # SS between groups, from per-group sums over the flattened scores
+    sizes = np.fromiter((len(g) for g in groups), dtype=np.int64, count=len(groups))
+    group_ids = np.repeat(np.arange(len(groups)), sizes)
+    group_means = np.bincount(group_ids, weights=np.concatenate(groups)) / sizes
+    ss_between = float(np.dot(sizes, (group_means - grand_mean) ** 2))
 
-    return float(ss_between / ss_total)
+    return ss_between / ss_total
 
 
-def analyze_dimension(
-    scores: list[float],
-    dimension_values: list[str],
-) -> tuple[float, float, str]:
+def _kruskal_and_eta_squared(
+    scores: np.ndarray,
+    codes: np.ndarray,
+    n_groups: int,
+) -> tuple[float, float]:
     """
-    Analyze the effect of a single dimension on scores.
+    Kruskal-Wallis p-value and eta-squared for scores grouped by integer codes.
 
-    Uses Kruskal-Wallis test (non-parametric alternative to ANOVA).
+    Computes the same H statistic (with tie correction) as scipy.stats.kruskal
+    from one ranking of the scores and per-group sums, without materializing
+    a list per group.
 
     Args:
         scores: Response scores
-        dimension_values: Dimension value for each score (aligned)
+        codes: Group code in [0, n_groups) for each score
+        n_groups: Number of groups; every code must occur at least once
 
     Returns:
-        Tuple of (effect_size, p_value, method)
+        Tuple of (p_value, eta_squared)
     """
-    if len(scores) != len(dimension_values):
-        raise ValueError("Scores and dimension values must have same length")
+    n_total = len(scores)
+    sizes = np.bincount(codes, minlength=n_groups)
+
+    # Average ranks: each distinct score gets the mean of the positions it spans
+    _, inverse, tie_counts = np.unique(scores, return_inverse=True, return_counts=True)
+    tie_counts = tie_counts.astype(np.float64)
+    ranks = (np.cumsum(tie_counts) - (tie_counts - 1) / 2.0)[inverse.reshape(-1)]
+
+    rank_sums = np.bincount(codes, weights=ranks, minlength=n_groups)
+    ssbn = sum((rank_sums ** 2 / sizes).tolist())
+    h = 12.0 / (n_total * (n_total + 1)) * ssbn - 3 * (n_total + 1)
+    h /= 1 - (tie_counts ** 3 - tie_counts).sum() / (n_total ** 3 - n_total)
+    p_value = float(special.chdtrc(n_groups - 1, h))
+
+    # Eta-squared = SS_between / SS_total (see compute_eta_squared)
+    grand_mean = scores.mean()
+    deviations = scores - grand_mean
+    ss_total = float(np.dot(deviations, deviations))
+    if ss_total == 0:
+        return p_value, 0.0
+    group_means = np.bincount(codes, weights=scores, minlength=n_groups) / sizes
+    ss_between = float(np.dot(sizes, (group_means - grand_mean) ** 2))
+
+    return p_value, ss_between / ss_total
+
 
+def _analyze_coded_dimension(
+    scores: np.ndarray,
+    codes: np.ndarray,
+    n_groups: int,
+) -> tuple[float, float, str]:
+    """analyze_dimension for scores whose dimension values are already coded."""
     if len(scores) < 3:
         return (0.0, 1.0, "kruskal_wallis")
 
-    # Group scores by dimension value
-    groups: dict[str, list[float]] = {}
-    for score, dim_val in zip(scores, dimension_values):
-        if dim_val not in groups:
-            groups[dim_val] = []
-        groups[dim_val].append(score)
-
     # Need at least 2 groups with data
-    valid_groups = [g for g in groups.values() if len(g) >= 1]
-    if len(valid_groups) < 2:
+    if n_groups < 2:
         return (0.0, 1.0, "kruskal_wallis")
 
     # Check if all groups have the same values (no variance)
-    all_values = [v for g in valid_groups for v in g]
-    if np.std(all_values) == 0:
+    if scores.min() == scores.max():
         return (0.0, 1.0, "kruskal_wallis")
 
-    # Kruskal-Wallis test
-    try:
-        h_stat, p_value = stats.kruskal(*valid_groups)
-    except ValueError:
-        # Can happen with constant values
-        return (0.0, 1.0, "kruskal_wallis")
+    p_value, effect_size = _kruskal_and_eta_squared(scores, codes, n_groups)
+
+    return (effect_size, p_value, "kruskal_wallis")
+
+
+def _encode(values: list[str]) -> tuple[np.ndarray, int]:
+    """Integer codes for values in first-appearance order, and the number of codes."""
+    code_map: dict[str, int] = {}
+    codes = np.fromiter(
+        (code_map.setdefault(value, len(code_map)) for value in values),
+        dtype=np.int64,
+        count=len(values),
+    )
+    return codes, len(code_map)
+
+
+def analyze_dimension(
+    scores: list[float],
+    dimension_values: list[str],
+) -> tuple[float, float, str]:
+    """
+    Analyze the effect of a single dimension on scores.
+
+    Uses Kruskal-Wallis test (non-parametric alternative to ANOVA).
+
+    Args:
+        scores: Response scores
+        dimension_values: Dimension value for each score (aligned)
 
-    # Effect size (eta-squared)
-    effect_size = compute_eta_squared(valid_groups, all_values)
+    Returns:
+        Tuple of (effect_size, p_value, method)
+    """
+    if len(scores) != len(dimension_values):
+        raise ValueError("Scores and dimension values must have same length")
 
-    return (effect_size, float(p_value), "kruskal_wallis")
+    codes, n_groups = _encode(dimension_values)
+    return _analyze_coded_dimension(np.asarray(scores, dtype=np.float64), codes, n_groups)
 
 
 def compute_dimension_effects(
@@ -163,6 +215,10 @@ def compute_dimension_effects(
     if not scores or not dimensions:
         return {}
 
+    # One float array shared by every dimension; each dimension becomes an
+    # integer code array
+    score_array = np.asarray(scores, dtype=np.float64)
+
     # Analyze each dimension
     effects: list[tuple[str, float, float]] = []
     for dim_name, dim_values in dimensions.items():
@@ -170,7 +226,8 @@ def compute_dimension_effects(
         if len(dim_values) != len(scores):
             continue
 
-        effect_size, p_value, _ = analyze_dimension(scores, dim_values)
+        codes, n_groups = _encode(dim_values)
+        effect_size, p_value, _ = _analyze_coded_dimension(score_array, codes, n_groups)
         effects.append((dim_name, effect_size, p_value))
 
     # Sort by effect size and assign ranks
@@ -189,7 +246,7 @@ def compute_dimension_effects(
 
 
 def compute_variance_explained(
-    transcripts: list[dict[str, Any]],
+    effects: dict[str, DimensionEffect],
 ) -> float:
     """
     Compute total variance explained by all dimensions (R-squared).
@@ -198,13 +255,11 @@ def compute_variance_explained(
     sum of eta-squared values (may overestimate with correlated dims).
 
     Args:
-        transcripts: List of transcript dicts
+        effects: Dimension effects from compute_dimension_effects
 
     Returns:
         Approximate R-squared value between 0 and 1
     """
-    effects = compute_dimension_effects(transcripts)
-
     if not effects:
         return 0.0
 
@@ -216,6 +271,21 @@ def compute_variance_explained(
     return min(round(total, 6), 1.0)
 
 
+def compute_variance_explained_from_transcripts(
+    transcripts: list[dict[str, Any]],
+) -> float:
+    """
+    Compute variance explained directly from transcripts.
+
+    Args:
+        transcripts: List of transcript dicts
+
+    Returns:
+        Approximate R-squared value between 0 and 1
+    """
+    return compute_variance_explained(compute_dimension_effects(transcripts))
+
+
 def compute_dimension_analysis(
     transcripts: list[dict[str, Any]],
     alpha: float = 0.05,
@@ -231,7 +301,7 @@ def compute_dimension_analysis(
         DimensionAnalysisResult with dimensions, variance explained, method
     """
     dimensions = compute_dimension_effects(transcripts, alpha)
-    variance = compute_variance_explained(transcripts)
+    variance = compute_variance_explained(dimensions)
 
     return DimensionAnalysisResult(
         dimensions=dimensions,
@@ -9,7 +9,7 @@ from typing import Any, TypedDict
 import itertools
 
 import numpy as np
-from scipy import stats
+from scipy import special, stats
 
 
 class PairwiseAgreement(TypedDict):
@@ -53,8 +53,8 @@ def compute_effect_size(group1: list[float], group2: list[float]) -> float:
     if len(group1) < 2 or len(group2) < 2:
         return 0.0
 
-    arr1 = np.array(group1)
-    arr2 = np.array(group2)
+    arr1 = np.fromiter(group1, dtype=np.float64, count=len(group1))
+    arr2 = np.fromiter(group2, dtype=np.float64, count=len(group2))
 
     n1, n2 = len(arr1), len(arr2)
     var1, var2 = np.var(arr1, ddof=1), np.var(arr2, ddof=1)
@@ -89,6 +89,27 @@ def interpret_effect_size(d: float) -> str:
         return "large"
 
 
+# Lower bounds of |d| for small, medium and large (see interpret_effect_size)
+_EFFECT_SIZE_THRESHOLDS = np.array([0.2, 0.5, 0.8])
+_EFFECT_SIZE_LABELS = np.array(["negligible", "small", "medium", "large"])
+
+
+def interpret_effect_sizes(effects: list[float]) -> list[str]:
+    """
+    Interpret many Cohen's d values at once.
+
+    Equivalent to calling interpret_effect_size on each value.
+
+    Args:
+        effects: Cohen's d values
+
+    Returns:
+        Interpretation string for each value
+    """
+    abs_d = np.abs(np.fromiter(effects, dtype=np.float64, count=len(effects)))
+    return _EFFECT_SIZE_LABELS[np.searchsorted(_EFFECT_SIZE_THRESHOLDS, abs_d, side="right")].tolist()
+
+
 def apply_holm_bonferroni(
     p_values: list[float],
     alpha: float = 0.05,
@@ -109,25 +130,73 @@ def apply_holm_bonferroni(
     if n == 0:
         return []
 
-    # Create index to track original positions
-    indexed = [(p, i) for i, p in enumerate(p_values)]
-    indexed.sort(key=lambda x: x[0])
+    p = np.asarray(p_values, dtype=np.float64)
+    # Stable sort so tied p-values keep their input order
+    order = np.argsort(p, kind="stable")
+    p_sorted = p[order]
+    # Holm-Bonferroni: the k-th smallest p (0-based) is compared to alpha / (n - k)
+    remaining = n - np.arange(n)
 
-    results = [None] * n
+    corrected_sorted = np.minimum(p_sorted * remaining, 1.0)
+    # Once a test is not significant, no later (larger) p-value can be
+    significant_sorted = np.logical_and.accumulate(p_sorted <= alpha / remaining)
 
-    for rank, (p, orig_idx) in enumerate(indexed):
-        # Holm-Bonferroni: compare to alpha / (n - rank)
-        adjusted_alpha = alpha / (n - rank)
-        corrected_p = min(p * (n - rank), 1.0)
-        significant = p <= adjusted_alpha
+    corrected = np.empty(n)
+    corrected[order] = corrected_sorted
+    significant = np.empty(n, dtype=bool)
+    significant[order] = significant_sorted
 
-        # If any prior test was not significant, this one isn't either
-        if rank > 0 and not results[indexed[rank - 1][1]][1]:
-            significant = False
+    return list(zip(corrected.tolist(), significant.tolist()))
 
-        results[orig_idx] = (corrected_p, significant)
 
-    return results
+def _spearman_matrix(scores: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Spearman's rho and two-sided p-values for every pair of rows.
+
+    Each row is ranked once and all correlations come from one np.corrcoef
+    call; p-values use the same t approximation as scipy.stats.spearmanr.
+    Entries involving a constant row are NaN.
+
+    Args:
+        scores: (n_models, n_observations) score matrix
+
+    Returns:
+        (rho, p_value) matrices of shape (n_models, n_models)
+    """
+    ranks = stats.rankdata(scores, axis=1)
+    dof = scores.shape[1] - 2
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rho = np.corrcoef(ranks)
+        t = rho * np.sqrt((dof / ((rho + 1.0) * (1.0 - rho))).clip(0))
+    p_value = 2 * special.stdtr(dof, -np.abs(t))
+
+    return rho, p_value
+
+
+def _effect_size_matrix(scores: np.ndarray) -> np.ndarray:
+    """
+    Cohen's d (row i minus row j) for every pair of equal-length rows.
+
+    Each row's mean and variance are computed once; see compute_effect_size.
+
+    Args:
+        scores: (n_models, n_observations) score matrix, n_observations >= 2
+
+    Returns:
+        (n_models, n_models) matrix of Cohen's d, 0 where the pooled std is 0
+    """
+    n = scores.shape[1]
+    means = scores.mean(axis=1)
+    variances = scores.var(axis=1, ddof=1)
+
+    # Pooled standard deviation
+    pooled_std = np.sqrt(
+        ((n - 1) * variances[:, None] + (n - 1) * variances[None, :]) / (n + n - 2)
+    )
+    with np.errstate(invalid="ignore", divide="ignore"):
+        effect = (means[:, None] - means[None, :]) / pooled_std
+    return np.where(pooled_std == 0, 0.0, effect)
 
 
 def compute_pairwise_agreement(
@@ -154,37 +223,56 @@ def compute_pairwise_agreement(
     pairs = list(itertools.combinations(model_ids, 2))
     raw_results: list[tuple[str, str, float, float, float]] = []
 
-    for model1, model2 in pairs:
-        scores1 = model_scores[model1]
-        scores2 = model_scores[model2]
+    # Scores aligned by scenario all have the same length: compute each
+    # model's ranks and moments once and every pair's statistics as matrices
+    lengths = {len(scores) for scores in model_scores.values()}
+    if len(lengths) == 1 and lengths.pop() >= 3:
+        score_matrix = np.array([model_scores[m] for m in model_ids], dtype=np.float64)
+        rho_matrix, p_matrix = _spearman_matrix(score_matrix)
+        effect_matrix = _effect_size_matrix(score_matrix)
+
+        for i, j in itertools.combinations(range(len(model_ids)), 2):
+            rho, p_value = float(rho_matrix[i, j]), float(p_matrix[i, j])
+            # Handle NaN (constant values)
+            if np.isnan(rho):
+                rho, p_value = 0.0, 1.0
+            raw_results.append(
+                (model_ids[i], model_ids[j], rho, p_value, float(effect_matrix[i, j]))
+            )
+    else:
+        for model1, model2 in pairs:
+            scores1 = model_scores[model1]
+            scores2 = model_scores[model2]
 
-        # Ensure same length (align by index)
-        min_len = min(len(scores1), len(scores2))
-        if min_len < 3:
-            # Not enough data for correlation
-            raw_results.append((model1, model2, 0.0, 1.0, 0.0))
-            continue
+            # Ensure same length (align by index)
+            min_len = min(len(scores1), len(scores2))
+            if min_len < 3:
+                # Not enough data for correlation
+                raw_results.append((model1, model2, 0.0, 1.0, 0.0))
+                continue
 
-        arr1 = np.array(scores1[:min_len])
-        arr2 = np.array(scores2[:min_len])
+            arr1 = np.fromiter(scores1, dtype=np.float64, count=min_len)
+            arr2 = np.fromiter(scores2, dtype=np.float64, count=min_len)
 
-        # Spearman's rho
-        rho, p_value = stats.spearmanr(arr1, arr2)
+            # Spearman's rho
+            rho, p_value = stats.spearmanr(arr1, arr2)
 
-        # Handle NaN (constant values)
-        if np.isnan(rho):
-            rho = 0.0
-            p_value = 1.0
+            # Handle NaN (constant values)
+            if np.isnan(rho):
+                rho = 0.0
+                p_value = 1.0
 
-        # Effect size
-        effect = compute_effect_size(list(arr1), list(arr2))
+            # Effect size
+            effect = compute_effect_size(scores1[:min_len], scores2[:min_len])
 
-        raw_results.append((model1, model2, float(rho), float(p_value), effect))
+            raw_results.append((model1, model2, float(rho), float(p_value), effect))
 
     # Apply Holm-Bonferroni correction
     p_values = [r[3] for r in raw_results]
     corrected = apply_holm_bonferroni(p_values, alpha)
 
+    interpretations = interpret_effect_sizes([r[4] for r in raw_results])
+
     # Build final results
     result: dict[str, PairwiseAgreement] = {}
     for i, (model1, model2, rho, p_val, effect) in enumerate(raw_results):
@@ -196,14 +284,15 @@ def compute_pairwise_agreement(
             pValueCorrected=round(corrected_p, 6),
             significant=significant,
             effectSize=round(effect, 6),
-            effectInterpretation=interpret_effect_size(effect),
+            effectInterpretation=interpretations[i],
         )
 
     return result
 
 
 def detect_outlier_models(
-    model_scores: dict[str, list[float]],
+    agreements: dict[str, PairwiseAgreement],
+    model_ids: list[str],
     threshold: float = 2.0,
 ) -> list[str]:
     """
@@ -213,50 +302,45 @@ def detect_outlier_models(
     more than `threshold` standard deviations from the mean.
 
     Args:
-        model_scores: Dict mapping model_id to list of scores
+        agreements: Pairwise agreement from compute_pairwise_agreement,
+            called with scores for model_ids in this order
+        model_ids: Model IDs the agreement was computed for
         threshold: Number of standard deviations (default 2.0)
 
     Returns:
         List of outlier model IDs
     """
-    model_ids = list(model_scores.keys())
-    if len(model_ids) < 3:
+    n_models = len(model_ids)
+    if n_models < 3:
         return []  # Need at least 3 models to detect outliers
 
-    # Calculate mean pairwise correlation for each model
-    agreements = compute_pairwise_agreement(model_scores)
-    model_agreement_means: dict[str, list[float]] = {m: [] for m in model_ids}
-
-    for pair_key, agreement in agreements.items():
-        model1, model2 = pair_key.split(":")
-        rho = agreement["spearmanRho"]
-        model_agreement_means[model1].append(rho)
-        model_agreement_means[model2].append(rho)
+    # compute_pairwise_agreement emits pairs in itertools.combinations order,
+    # which is the row-major upper triangle of the model-by-model matrix
+    pair_i, pair_j = np.triu_indices(n_models, k=1)
+    if len(agreements) != len(pair_i):
+        raise ValueError("Agreements must cover every pair of model_ids")
+    rhos = np.fromiter(
+        (agreement["spearmanRho"] for agreement in agreements.values()),
+        dtype=np.float64,
+        count=len(pair_i),
+    )
 
-    # Calculate mean agreement per model
-    mean_per_model = {
-        m: np.mean(vals) if vals else 0.0
-        for m, vals in model_agreement_means.items()
-    }
+    # Calculate mean pairwise correlation for each model: every pair
+    # contributes its rho to both of its models
+    rho_sums = np.bincount(pair_i, weights=rhos, minlength=n_models) + np.bincount(
+        pair_j, weights=rhos, minlength=n_models
+    )
+    mean_per_model = rho_sums / (n_models - 1)
 
     # Find outliers (low agreement with others)
-    all_means = list(mean_per_model.values())
-    if len(all_means) < 3:
-        return []
-
-    overall_mean = np.mean(all_means)
-    overall_std = np.std(all_means, ddof=1)
+    overall_mean = mean_per_model.mean()
+    overall_std = mean_per_model.std(ddof=1)
 
     if overall_std == 0:
         return []
 
-    outliers = []
-    for model_id, mean_agreement in mean_per_model.items():
-        z_score = (mean_agreement - overall_mean) / overall_std
-        if abs(z_score) > threshold:
-            outliers.append(model_id)
-
-    return outliers
+    z_scores = (mean_per_model - overall_mean) / overall_std
+    return [model_ids[i] for i in np.flatnonzero(np.abs(z_scores) > threshold)]
 
 
 def compute_model_agreement(
@@ -274,7 +358,7 @@ def compute_model_agreement(
         ModelAgreementResult with pairwise, outliers, and overall agreement
     """
     pairwise = compute_pairwise_agreement(model_scores, alpha)
-    outliers = detect_outlier_models(model_scores)
+    outliers = detect_outlier_models(pairwise, list(model_scores.keys()))
 
     # Overall agreement is mean of all pairwise correlations
     if pairwise:
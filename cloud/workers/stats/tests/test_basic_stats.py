@@ -1,8 +1,14 @@
 """Unit tests for basic_stats.compute_win_rate, compute_value_stats, and aggregation."""
 
+import numpy as np
 import pytest
 
-from stats.basic_stats import aggregate_transcripts_by_model, compute_value_stats, compute_win_rate
+from stats.basic_stats import (
+    aggregate_transcripts_by_model,
+    compute_value_stats,
+    compute_value_stats_batch,
+    compute_win_rate,
+)
 
 
 def make_transcript(
@@ -83,6 +89,20 @@ class TestComputeValueStats:
         assert stats["winRate"] == pytest.approx(0.5)
 
 
+class TestComputeValueStatsBatch:
+    def test_matches_scalar_version(self):
+        counts = [(1, 0, 9), (1.25, 2.5, 0.25), (0, 0, 0), (3, 1, 0), (1 / 3, 2 / 3, 0)]
+        prioritized, deprioritized, neutral = (np.array(column, dtype=np.float64) for column in zip(*counts))
+
+        batch = compute_value_stats_batch(prioritized, deprioritized, neutral)
+
+        assert batch == [compute_value_stats(*row) for row in counts]
+
+    def test_empty_input(self):
+        empty = np.array([], dtype=np.float64)
+        assert compute_value_stats_batch(empty, empty, empty) == []
+
+
 class TestAggregateTranscriptsByModel:
     def test_worked_example_uses_condition_weighting(self):
         transcripts: list[dict[str, object]] = []
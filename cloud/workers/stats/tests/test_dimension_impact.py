@@ -0,0 +1,66 @@
+"""Unit tests for dimension_impact effect sizes."""
+
+import pytest
+from scipy import stats
+
+from stats.dimension_impact import (
+    DimensionEffect,
+    analyze_dimension,
+    compute_eta_squared,
+    compute_variance_explained,
+)
+
+
+class TestComputeEtaSquared:
+    def test_matches_hand_computed_value(self):
+        """Groups [1, 2] and [4, 5]: SS_between = 9, SS_total = 10."""
+        groups = [[1.0, 2.0], [4.0, 5.0]]
+        assert compute_eta_squared(groups, [1.0, 2.0, 4.0, 5.0]) == pytest.approx(0.9)
+
+    def test_unequal_group_sizes(self):
+        groups = [[0.0, 0.0, 0.0], [2.0]]
+        # grand mean 0.5; SS_between = 3 * 0.25 + 1 * 2.25 = 3.0 = SS_total
+        assert compute_eta_squared(groups, [0.0, 0.0, 0.0, 2.0]) == pytest.approx(1.0)
+
+    def test_constant_values_return_zero(self):
+        assert compute_eta_squared([[1.0, 1.0], [1.0]], [1.0, 1.0, 1.0]) == 0.0
+
+    def test_needs_two_non_empty_groups(self):
+        assert compute_eta_squared([[1.0, 2.0], []], [1.0, 2.0]) == 0.0
+        assert compute_eta_squared([], []) == 0.0
+
+
+class TestAnalyzeDimension:
+    def test_matches_scipy_kruskal_with_ties(self):
+        scores = [1.0, 2.0, 2.0, 3.0, -1.0, 0.0, 2.0, 4.0, 4.0]
+        values = ["a", "b", "a", "c", "b", "b", "c", "a", "c"]
+        groups = {v: [s for s, g in zip(scores, values) if g == v] for v in "abc"}
+
+        effect_size, p_value, method = analyze_dimension(scores, values)
+
+        assert method == "kruskal_wallis"
+        assert p_value == pytest.approx(stats.kruskal(*groups.values()).pvalue)
+        assert effect_size == pytest.approx(compute_eta_squared(list(groups.values()), scores))
+
+    def test_single_group_or_constant_scores(self):
+        assert analyze_dimension([1.0, 2.0, 3.0], ["a", "a", "a"]) == (0.0, 1.0, "kruskal_wallis")
+        assert analyze_dimension([2.0, 2.0, 2.0], ["a", "b", "a"]) == (0.0, 1.0, "kruskal_wallis")
+
+    def test_length_mismatch_raises(self):
+        with pytest.raises(ValueError):
+            analyze_dimension([1.0, 2.0], ["a"])
+
+
+class TestComputeVarianceExplained:
+    def test_sums_effect_sizes_capped_at_one(self):
+        effects = {
+            "a": DimensionEffect(effectSize=0.25, rank=1, pValue=0.01, significant=True),
+            "b": DimensionEffect(effectSize=0.125, rank=2, pValue=0.2, significant=False),
+        }
+        assert compute_variance_explained(effects) == pytest.approx(0.375)
+
+        effects["c"] = DimensionEffect(effectSize=0.9, rank=3, pValue=0.01, significant=True)
+        assert compute_variance_explained(effects) == 1.0
+
+    def test_no_effects(self):
+        assert compute_variance_explained({}) == 0.0
@@ -0,0 +1,158 @@
+"""Unit tests for model_comparison pairwise agreement."""
+
+import itertools
+import warnings
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from stats.model_comparison import (
+    PairwiseAgreement,
+    apply_holm_bonferroni,
+    compute_effect_size,
+    compute_pairwise_agreement,
+    detect_outlier_models,
+    interpret_effect_size,
+    interpret_effect_sizes,
+)
+
+
+def _pairwise_spearman(model_scores: dict[str, list[float]]) -> dict[str, tuple[float, float]]:
+    """Reference: scipy.stats.spearmanr called once per pair."""
+    expected = {}
+    for model1, model2 in itertools.combinations(model_scores, 2):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            rho, p_value = stats.spearmanr(model_scores[model1], model_scores[model2])
+        if np.isnan(rho):
+            rho, p_value = 0.0, 1.0
+        expected[f"{model1}:{model2}"] = (round(float(rho), 6), round(float(p_value), 6))
+    return expected
+
+
+class TestComputePairwiseAgreement:
+    @pytest.mark.parametrize("n_models", [2, 3, 6])
+    def test_matches_per_pair_spearman(self, n_models):
+        rng = np.random.default_rng(n_models)
+        model_scores = {
+            f"m{i}": rng.integers(-2, 3, size=25).astype(float).tolist() for i in range(n_models)
+        }
+
+        result = compute_pairwise_agreement(model_scores)
+
+        assert {k: (v["spearmanRho"], v["pValue"]) for k, v in result.items()} == _pairwise_spearman(model_scores)
+
+    def test_effect_sizes_match_per_pair_cohens_d(self):
+        rng = np.random.default_rng(7)
+        model_scores = {f"m{i}": rng.normal(i * 0.3, 1.0, size=30).tolist() for i in range(5)}
+        model_scores["flat"] = [0.5] * 30
+        model_scores["flat2"] = [0.5] * 30
+
+        result = compute_pairwise_agreement(model_scores)
+
+        for model1, model2 in itertools.combinations(model_scores, 2):
+            expected = compute_effect_size(model_scores[model1], model_scores[model2])
+            assert result[f"{model1}:{model2}"]["effectSize"] == round(expected, 6)
+
+    def test_constant_model_has_zero_rho(self):
+        model_scores = {
+            "flat": [1.0] * 6,
+            "a": [1.0, 2.0, 0.0, -1.0, 2.0, -2.0],
+            "b": [2.0, 2.0, 1.0, -2.0, 1.0, -1.0],
+        }
+
+        result = compute_pairwise_agreement(model_scores)
+
+        assert result["flat:a"]["spearmanRho"] == 0.0
+        assert result["flat:a"]["pValue"] == 1.0
+        assert result["a:b"]["spearmanRho"] == _pairwise_spearman(model_scores)["a:b"][0]
+
+    def test_unequal_lengths_are_truncated_per_pair(self):
+        model_scores = {
+            "a": [1.0, 2.0, 3.0, 4.0, 5.0],
+            "b": [1.0, 2.0, 3.0],
+            "c": [5.0, 4.0, 3.0, 2.0, 1.0],
+        }
+
+        result = compute_pairwise_agreement(model_scores)
+
+        assert result["a:b"]["spearmanRho"] == pytest.approx(1.0)
+        assert result["a:c"]["spearmanRho"] == pytest.approx(-1.0)
+        assert result["b:c"]["spearmanRho"] == pytest.approx(-1.0)
+
+    def test_too_few_observations(self):
+        result = compute_pairwise_agreement({"a": [1.0, 2.0], "b": [2.0, 1.0]})
+        assert result["a:b"]["spearmanRho"] == 0.0
+        assert result["a:b"]["pValue"] == 1.0
+
+
+def _agreement(rho: float) -> PairwiseAgreement:
+    return PairwiseAgreement(
+        spearmanRho=rho,
+        pValue=0.5,
+        pValueCorrected=0.5,
+        significant=False,
+        effectSize=0.0,
+        effectInterpretation="negligible",
+    )
+
+
+class TestDetectOutlierModels:
+    def test_flags_model_that_disagrees_with_all_others(self):
+        model_ids = [f"m{i}" for i in range(8)]
+        agreements = {
+            f"{a}:{b}": _agreement(-0.5 if "m3" in (a, b) else 0.9)
+            for a, b in itertools.combinations(model_ids, 2)
+        }
+        assert detect_outlier_models(agreements, model_ids) == ["m3"]
+
+    def test_uniform_agreement_has_no_outliers(self):
+        model_ids = ["a", "b", "c", "d"]
+        agreements = {f"{a}:{b}": _agreement(0.7) for a, b in itertools.combinations(model_ids, 2)}
+        assert detect_outlier_models(agreements, model_ids) == []
+
+    def test_model_ids_may_contain_colons(self):
+        model_ids = [f"provider:model-{i}" for i in range(8)]
+        agreements = {
+            f"{a}:{b}": _agreement(-0.5 if a == model_ids[0] else 0.9)
+            for a, b in itertools.combinations(model_ids, 2)
+        }
+        assert detect_outlier_models(agreements, model_ids) == ["provider:model-0"]
+
+    def test_missing_pairs_raise(self):
+        with pytest.raises(ValueError):
+            detect_outlier_models({"a:b": _agreement(0.1)}, ["a", "b", "c"])
+
+    def test_needs_three_models(self):
+        assert detect_outlier_models({"a:b": _agreement(0.1)}, ["a", "b"]) == []
+
+
+class TestInterpretEffectSizes:
+    def test_matches_scalar_interpretation_at_boundaries(self):
+        effects = [0.0, 0.19, 0.2, -0.2, 0.49, 0.5, -0.79, 0.8, 3.0, float("nan")]
+        assert interpret_effect_sizes(effects) == [interpret_effect_size(d) for d in effects]
+
+    def test_empty(self):
+        assert interpret_effect_sizes([]) == []
+
+
+class TestApplyHolmBonferroni:
+    def test_worked_example(self):
+        # Sorted: 0.01 <= 0.05 / 4 passes, 0.02 > 0.05 / 3 fails and so do the rest
+        result = apply_holm_bonferroni([0.04, 0.01, 0.03, 0.02])
+
+        assert [p for p, _ in result] == pytest.approx([0.04, 0.04, 0.06, 0.06])
+        assert [sig for _, sig in result] == [False, True, False, False]
+
+    def test_stops_at_first_non_significant(self):
+        """A later p-value under its own threshold is not significant once one fails."""
+        result = apply_holm_bonferroni([0.001, 0.04, 0.045], alpha=0.05)
+        # 0.04 > 0.05 / 2, so 0.045 (<= 0.05 / 1) is not significant either
+        assert [sig for _, sig in result] == [True, False, False]
+
+    def test_corrected_p_capped_at_one(self):
+        assert apply_holm_bonferroni([0.6, 0.7]) == [(1.0, False), (0.7, False)]
+
+    def test_empty(self):
+        assert apply_holm_bonferroni([]) == []
@@ -6,6 +6,11 @@ to measure model consistency and response stability.
 """
 
 from typing import Any, Literal, Optional, TypedDict
+from operator import itemgetter
+import heapq
+import itertools
+import math
+
 import numpy as np
 
 from stats.decision_model import SIGNED_TO_BUCKET, resolve_transcript_signed_distance
@@ -66,6 +71,10 @@ class RunVarianceAnalysis(_RunVarianceAnalysisBase, _RunVarianceAnalysisOptional
     """Complete variance analysis for a run."""
 
 
+# Below this many scores compute_variance_stats skips NumPy
+_SMALL_SAMPLE_SIZE = 32
+
+
 def _canonical_to_signed(direction: str, strength: str) -> float | None:
     """Map canonical direction/strength to signed distance (−2 to +2)."""
     if direction == "favor_first" and strength == "strong":
@@ -102,19 +111,119 @@ def compute_variance_stats(scores: list[float]) -> VarianceStats:
             range=0.0,
         )
 
-    arr = np.array(scores)
-    n = len(arr)
-    mean = float(np.mean(arr))
-    std_dev = float(np.std(arr, ddof=1)) if n > 1 else 0.0
+    n = len(scores)
+    if n < _SMALL_SAMPLE_SIZE:
+        # Typical multi-sample groups hold 3-10 scores: plain Python beats
+        # paying NumPy's per-call overhead six times
+        mean = sum(scores) / n
+        std_dev = math.sqrt(sum((s - mean) ** 2 for s in scores) / (n - 1)) if n > 1 else 0.0
+        lowest = float(min(scores))
+        highest = float(max(scores))
+    else:
+        arr = np.fromiter(scores, dtype=np.float64, count=n)
+        mean = float(np.mean(arr))
+        std_dev = float(np.std(arr, ddof=1))
+        lowest = float(np.min(arr))
+        highest = float(np.max(arr))
 
     return VarianceStats(
         sampleCount=n,
         mean=round(mean, 6),
         stdDev=round(std_dev, 6),
         variance=round(std_dev ** 2, 6),
-        min=round(float(np.min(arr)), 6),
-        max=round(float(np.max(arr)), 6),
-        range=round(float(np.max(arr) - np.min(arr)), 6),
+        min=round(lowest, 6),
+        max=round(highest, 6),
+        range=round(highest - lowest, 6),
+    )
+
+
+def _compute_group_variance_stats(groups: list[list[float]]) -> list[VarianceStats]:
+    """
+    compute_variance_stats for many non-empty score groups at once.
+
+    The groups are laid end to end in one array and every statistic is a
+    segmented reduction over it, so the NumPy calls do not scale with the
+    number of groups.
+
+    Args:
+        groups: Non-empty lists of numeric scores
+
+    Returns:
+        VarianceStats for each group, in order
+    """
+    if not groups:
+        return []
+
+    counts = np.fromiter((len(g) for g in groups), dtype=np.int64, count=len(groups))
+    scores = np.fromiter(
+        itertools.chain.from_iterable(groups), dtype=np.float64, count=int(counts.sum())
+    )
+    offsets = np.cumsum(counts) - counts
+
+    # Two-pass sample variance, as np.std(ddof=1) computes it
+    means = np.add.reduceat(scores, offsets) / counts
+    deviations = scores - np.repeat(means, counts)
+    squared_sums = np.add.reduceat(deviations * deviations, offsets)
+    std_devs = np.sqrt(
+        np.divide(squared_sums, counts - 1, out=np.zeros(len(groups)), where=counts > 1)
+    )
+    mins = np.minimum.reduceat(scores, offsets)
+    maxs = np.maximum.reduceat(scores, offsets)
+
+    # Round every statistic of every group in one call
+    rounded = np.round(
+        np.stack([means, std_devs, std_devs ** 2, mins, maxs, maxs - mins]), 6
+    ).tolist()
+
+    return [
+        VarianceStats(
+            sampleCount=n,
+            mean=mean,
+            stdDev=std_dev,
+            variance=variance,
+            min=lo,
+            max=hi,
+            range=spread,
+        )
+        for n, mean, std_dev, variance, lo, hi, spread in zip(counts.tolist(), *rounded)
+    ]
+
+
+def _single_sample_variance_stats(score: float) -> VarianceStats:
+    """
+    Per-scenario stats for a group with exactly one score.
+
+    Matches what compute_variance_analysis derives for a one-score group,
+    without the NumPy reductions, median or percentile calls.
+    """
+    value = round(score, 6)
+    if score > 0:
+        direction: Literal["A", "B", "NEUTRAL"] = "A"
+    elif score < 0:
+        direction = "B"
+    else:
+        direction = "NEUTRAL"
+
+    direction_counts: dict[str, int] = {b: 0 for b in SIGNED_TO_BUCKET.values()}
+    bucket = SIGNED_TO_BUCKET.get(score)
+    if bucket is not None:
+        direction_counts[bucket] += 1
+
+    return VarianceStats(
+        sampleCount=1,
+        mean=value,
+        stdDev=0.0,
+        variance=0.0,
+        min=value,
+        max=value,
+        range=0.0,
+        directionCounts=direction_counts,
+        direction=direction,
+        directionalAgreement=1.0,
+        medianSignedDistance=value,
+        iqr=None,
+        neutralShare=1.0 if score == 0 else 0.0,
+        orientationCorrected=False,
     )
 
 
@@ -135,10 +244,10 @@ def compute_consistency_score(variances: list[float], max_possible_variance: flo
     if not variances:
         return 1.0  # No data means consistent by default
 
-    avg_variance = float(np.mean(variances))
+    avg_variance = sum(variances) / len(variances)
     # Normalize: 0 variance = 1.0 consistency, max variance = 0.0 consistency
     score = 1.0 - (avg_variance / max_possible_variance)
-    return round(max(0.0, min(1.0, score)), 6)
+    return round(0.0 if score < 0.0 else 1.0 if score > 1.0 else score, 6)
 
 
 def compute_variance_analysis(
@@ -152,47 +261,82 @@ def compute_variance_analysis(
 
     Args:
         transcripts: List of transcript dicts with modelId, scenarioId,
-                    sampleIndex, and summary.score
+                    and decisionModelV2.canonical
 
     Returns:
         RunVarianceAnalysis with per-model and per-scenario variance stats
     """
-    # Group by (scenarioId, modelId) -> list of (sampleIndex, signedDistance)
-    grouped: dict[tuple[str, str], list[tuple[int, float]]] = {}
+    # Group by (scenarioId, modelId) -> list of signed distances
+    grouped: dict[tuple[str, str], list[float]] = {}
     scenario_names: dict[str, str] = {}
 
     for t in transcripts:
         scenario_id = t.get("scenarioId", "unknown")
         model_id = t.get("modelId", "unknown")
-        sample_index = t.get("sampleIndex", 0)
         scenario = t.get("scenario", {})
         signed = resolve_transcript_signed_distance(t)
         if signed is None:
             continue
 
         key = (scenario_id, model_id)
-        if key not in grouped:
-            grouped[key] = []
+        group = grouped.get(key)
+        if group is None:
+            group = grouped[key] = []
             scenario_names[scenario_id] = scenario.get("name", scenario_id)
 
-        grouped[key].append((sample_index, signed))
+        group.append(signed)
+
+    # One pass over the groups: group scores by model, track the largest
+    # sample count, and note which groups have more than one sample
+    max_samples = 1
+    model_scenarios: dict[str, dict[str, list[float]]] = {}
+    model_scenario_scores: list[list[float]] = []
+    multi_sample_keys: list[tuple[str, str]] = []
+    for key, scores in grouped.items():
+        scenario_id, model_id = key
+        model_groups = model_scenarios.get(model_id)
+        if model_groups is None:
+            model_groups = model_scenarios[model_id] = {}
+        model_groups[scenario_id] = scores
+        model_scenario_scores.append(scores)
+        if len(scores) > 1:
+            multi_sample_keys.append(key)
+            max_samples = max(max_samples, len(scores))
 
     # Determine if this is a multi-sample run
-    max_samples = max(len(scores) for scores in grouped.values()) if grouped else 1
     is_multi_sample = max_samples > 1
 
+    if not is_multi_sample:
+        # One score per group: no within-scenario variance to measure
+        return RunVarianceAnalysis(
+            isMultiSample=False,
+            samplesPerScenario=max_samples,
+            perModel={
+                model_id: ModelVarianceStats(
+                    totalSamples=len(scenarios),
+                    uniqueScenarios=len(scenarios),
+                    samplesPerScenario=max_samples,
+                    avgWithinScenarioVariance=0.0,
+                    maxWithinScenarioVariance=0.0,
+                    consistencyScore=1.0,
+                    perScenario={
+                        scenario_id: _single_sample_variance_stats(scores[0])
+                        for scenario_id, scores in scenarios.items()
+                    },
+                )
+                for model_id, scenarios in model_scenarios.items()
+            },
+            mostVariableScenarios=[],
+            leastVariableScenarios=[],
+            orientationCorrectedCount=0,
+        )
+
+    # Variance stats for every (scenario, model) group in one batch
+    group_stats = dict(zip(grouped, _compute_group_variance_stats(model_scenario_scores)))
+
     # Compute per-model variance stats
     per_model: dict[str, ModelVarianceStats] = {}
 
-    # First, group by model
-    model_scenarios: dict[str, dict[str, list[float]]] = {}
-    for (scenario_id, model_id), sample_scores in grouped.items():
-        if model_id not in model_scenarios:
-            model_scenarios[model_id] = {}
-        # Extract just the scores (ignore sample index)
-        scores = [s for _, s in sample_scores]
-        model_scenarios[model_id][scenario_id] = scores
-
     # Compute stats for each model
     for model_id, scenarios in model_scenarios.items():
         per_scenario: dict[str, VarianceStats] = {}
@@ -200,7 +344,7 @@ def compute_variance_analysis(
         total_samples = 0
 
         for scenario_id, scores in scenarios.items():
-            stats = compute_variance_stats(scores)
+            stats = group_stats[(scenario_id, model_id)]
             if len(scores) > 0:
                 # scores are signed distances (−2 to +2)
                 median_sd = float(np.median(scores))
@@ -266,25 +410,28 @@ def compute_variance_analysis(
 
     # Find most/least variable scenarios (across all models)
     all_scenario_variances: list[dict[str, Any]] = []
-    for (scenario_id, model_id), sample_scores in grouped.items():
-        if len(sample_scores) > 1:
-            scores = [s for _, s in sample_scores]
-            stats = compute_variance_stats(scores)
-            all_scenario_variances.append({
-                "scenarioId": scenario_id,
-                "scenarioName": scenario_names.get(scenario_id, scenario_id),
-                "modelId": model_id,
-                "variance": stats["variance"],
-                "stdDev": stats["stdDev"],
-                "range": stats["range"],
-                "sampleCount": stats["sampleCount"],
-                "mean": stats["mean"],
-            })
-
-    # Sort by variance
-    all_scenario_variances.sort(key=lambda x: x["variance"], reverse=True)
-    most_variable = all_scenario_variances[:5] if all_scenario_variances else []
-    least_variable = all_scenario_variances[-5:][::-1] if len(all_scenario_variances) > 5 else []
+    for scenario_id, model_id in multi_sample_keys:
+        stats = group_stats[(scenario_id, model_id)]
+        all_scenario_variances.append({
+            "scenarioId": scenario_id,
+            "scenarioName": scenario_names.get(scenario_id, scenario_id),
+            "modelId": model_id,
+            "variance": stats["variance"],
+            "stdDev": stats["stdDev"],
+            "range": stats["range"],
+            "sampleCount": stats["sampleCount"],
+            "mean": stats["mean"],
+        })
+
+    # Top and bottom five by variance. Ties keep the order a stable descending
+    # sort would give: first-seen first at the top, last-seen first at the bottom.
+    by_variance = itemgetter("variance")
+    most_variable = heapq.nlargest(5, all_scenario_variances, key=by_variance)
+    least_variable = (
+        heapq.nsmallest(5, reversed(all_scenario_variances), key=by_variance)
+        if len(all_scenario_variances) > 5
+        else []
+    )
 
     return RunVarianceAnalysis(
         isMultiSample=is_multi_sample,
@@ -4,9 +4,9 @@ Reads JSON from stdin and writes JSON to stdout.
 """
 
 import json
-import sys
-from typing import Any
+from typing import Any, Union
 
+from common import json_io
 from common.errors import ErrorCode, ValidationError, classify_exception
 from common.logging import get_logger
 from summarize import (
@@ -111,83 +111,60 @@ def run_summarize_batch(data: dict[str, Any]) -> dict[str, Any]:
     }
 
 
-def main() -> None:
-    """Read JSON from stdin and write JSON to stdout."""
+def process_input(raw_input: Union[str, bytes]) -> dict[str, Any]:
+    """Run one summarize job (single transcript or batch) from its raw JSON input."""
     try:
-        input_data = sys.stdin.read()
-        if not input_data.strip():
-            print(
-                json.dumps(
-                    {
-                        "success": False,
-                        "error": _validation_error("No input provided"),
-                    }
-                )
-            )
-            return
+        if not raw_input.strip():
+            return {
+                "success": False,
+                "error": _validation_error("No input provided"),
+            }
 
         try:
-            data = json.loads(input_data)
+            data = json_io.loads(raw_input)
         except json.JSONDecodeError as err:
-            print(
-                json.dumps(
-                    {
-                        "success": False,
-                        "error": _validation_error(f"Invalid JSON input: {err}"),
-                    }
-                )
-            )
-            return
-
-        if isinstance(data, dict):
-            if "transcripts" in data:
-                if not is_batch_envelope(data):
-                    print(
-                        json.dumps(
-                            {
-                                "success": False,
-                                "error": _validation_error(
-                                    "Batch envelopes cannot include transcriptId or transcriptContent"
-                                ),
-                            }
-                        )
-                    )
-                    return
-
-                result = run_summarize_batch(data)
-            else:
-                try:
-                    validate_input(data)
-                except ValidationError as err:
-                    print(json.dumps({"success": False, "error": err.to_dict()}))
-                    return
-
-                result = run_summarize(data)
-        else:
-            print(
-                json.dumps(
-                    {
-                        "success": False,
-                        "error": _validation_error("Input must be a JSON object"),
-                    }
-                )
-            )
-            return
+            return {
+                "success": False,
+                "error": _validation_error(f"Invalid JSON input: {err}"),
+            }
 
-        print(json.dumps(result))
+        if not isinstance(data, dict):
+            return {
+                "success": False,
+                "error": _validation_error("Input must be a JSON object"),
+            }
 
-    except Exception as err:
-        log.error("Unexpected error in summarize worker", err=err)
-        print(
-            json.dumps(
-                {
+        if "transcripts" in data:
+            if not is_batch_envelope(data):
+                return {
                     "success": False,
-                    "error": {
-                        "message": str(err),
-                        "code": ErrorCode.UNKNOWN.value,
-                        "retryable": True,
-                        "details": type(err).__name__,
-                    },
+                    "error": _validation_error(
+                        "Batch envelopes cannot include transcriptId or transcriptContent"
+                    ),
                 }
-            )
-        )
+
+            return run_summarize_batch(data)
+
+        try:
+            validate_input(data)
+        except ValidationError as err:
+            return {"success": False, "error": err.to_dict()}
+
+        return run_summarize(data)
+
+    except Exception as err:
+        log.error("Unexpected error in summarize worker", err=err)
+        return {
+            "success": False,
+            "error": {
+                "message": str(err),
+                "code": ErrorCode.UNKNOWN.value,
+                "retryable": True,
+                "details": type(err).__name__,
+            },
+        }
+
+
+def main() -> None:
+    """Read JSON from stdin and write JSON to stdout."""
+    json_io.write_stdout(process_input(json_io.read_stdin()))
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """Decision extraction helpers for the summarize worker."""
 
+import functools
 import os
 import re
 from typing import Any, Optional
@@ -32,8 +33,20 @@ STRUCTURED_DECISION_PATTERNS = [
     re.compile(r"^\s*([1-9]\d*)\s*[—-]\s*", re.IGNORECASE | re.MULTILINE),
 ]
 
+# Every structured decision format as one alternation. It matches somewhere in
+# a text exactly when at least one of the individual patterns does, so a single
+# scan rules out texts without any explicit decision phrase. (Used as a screen
+# only: alternation consumes text, so it cannot stand in for the per-pattern
+# scans that decide which format wins.)
+ANY_STRUCTURED_DECISION_PATTERN = re.compile(
+    "|".join(f"(?:{pattern.pattern})" for pattern in STRUCTURED_DECISION_PATTERNS),
+    re.IGNORECASE | re.MULTILINE,
+)
+
 # Fallback pattern to find positive integer ratings - less reliable
 FALLBACK_RATING_PATTERN = re.compile(r"\b([1-9]\d*)\b")
+# Every decision code pattern captures a number starting with one of these
+NONZERO_DIGITS = "123456789"
 RANGE_PATTERN = re.compile(r"([1-9]\d*)\s*(?:-|–|—|to)\s*([1-9]\d*)", re.IGNORECASE)
 # Word-count parentheticals appended by some models, e.g. "(5 words)" or "(152 words)".
 # Must be stripped before fallback numeric scanning to avoid false code matches.
@@ -51,6 +64,13 @@ USER_DIRECTED_PATTERN = re.compile(
     re.IGNORECASE,
 )
 SELF_RATING_PATTERN = re.compile(r"\b(i|i'm|i’d|i'd|i would|my|for me|personally)\b", re.IGNORECASE)
+# Both heuristics in one alternation so the response is scanned once. No
+# user-directed phrase overlaps a self-rating word, so a self-rating match is
+# never hidden behind a user-directed one.
+USER_OR_SELF_PATTERN = re.compile(
+    rf"(?P<user>{USER_DIRECTED_PATTERN.pattern})|(?P<self>{SELF_RATING_PATTERN.pattern})",
+    re.IGNORECASE,
+)
 REFUSAL_PATTERN = re.compile(
     r"\b("
     r"must decline|decline to (?:engage|respond|answer)|"
@@ -482,6 +502,33 @@ def extract_leading_text_label_decision(
     return None, None, None
 
 
+def _match_structured_decision(text: str) -> tuple[bool, Optional[str]]:
+    """
+    Apply STRUCTURED_DECISION_PATTERNS in order; the first format found decides.
+
+    Returns (False, None) when no format matches. Otherwise returns True with
+    the matched code, or with None when that format's matches conflict or are
+    immediately followed by another candidate code (e.g. "I choose 3 and 4").
+    """
+    if ANY_STRUCTURED_DECISION_PATTERN.search(text) is None:
+        return False, None
+
+    for pattern in STRUCTURED_DECISION_PATTERNS:
+        decision_value: Optional[str] = None
+        for match in pattern.finditer(text):
+            suffix = text[match.end():match.end() + 24]
+            if AMBIGUOUS_SUFFIX_PATTERN.search(suffix):
+                return True, None
+            if decision_value is None:
+                decision_value = match.group(1)
+            elif match.group(1) != decision_value:
+                return True, None
+        if decision_value is not None:
+            return True, decision_value
+
+    return False, None
+
+
 def extract_decision_code_from_text(text: str) -> Optional[str]:
     """
     Extract numeric decision code (positive integer) from text.
@@ -491,7 +538,16 @@ def extract_decision_code_from_text(text: str) -> Optional[str]:
 
     Returns None if no rating found.
     """
-    if not text:
+    # Nothing below can match whitespace alone
+    if not text or text.isspace():
+        return None
+
+    # Every code returned below starts with an ASCII digit 1-9. Substring checks
+    # rule that out far faster than a regex scan of a long response, leaving
+    # only the refusal check for digit-free text.
+    if not any(digit in text for digit in NONZERO_DIGITS):
+        if REFUSAL_PATTERN.search(text):
+            return "refusal"
         return None
 
     # Strip lightweight markdown markers that often surround numeric answers.
@@ -506,22 +562,9 @@ def extract_decision_code_from_text(text: str) -> Optional[str]:
         return structured_match.group(1)
 
     # Next, look for common explicit decision formats.
-    for pattern in STRUCTURED_DECISION_PATTERNS:
-        matches = []
-        for match in pattern.finditer(sanitized_markdown_text):
-            # If immediate continuation suggests multiple candidate codes
-            # (e.g., "I choose 3 and 4"), treat as ambiguous.
-            suffix = sanitized_markdown_text[match.end():match.end() + 24]
-            if AMBIGUOUS_SUFFIX_PATTERN.search(suffix):
-                return None
-            matches.append(match.group(1))
-        if not matches:
-            continue
-        unique_values = list(dict.fromkeys(matches))
-        if len(unique_values) == 1:
-            return unique_values[0]
-        # If an explicit format provides conflicting values, treat as ambiguous.
-        return None
+    matched, decision_value = _match_structured_decision(sanitized_markdown_text)
+    if matched:
+        return decision_value
 
     # Remove numeric ranges (e.g., "1-6", "1 to 6") before fallback scanning.
     sanitized_text = RANGE_PATTERN.sub(" ", sanitized_markdown_text)
@@ -530,26 +573,40 @@ def extract_decision_code_from_text(text: str) -> Optional[str]:
     # a false positive that the out-of-range guard cannot catch.
     sanitized_text = WORD_COUNT_SUFFIX_PATTERN.sub(" ", sanitized_text)
 
-    fallback_matches = [m.group(1) for m in FALLBACK_RATING_PATTERN.finditer(sanitized_text)]
-    if not fallback_matches:
+    # If the model enumerates multiple options (e.g., "1..6"), it did not choose
+    # one: stop at the first number that differs from the first one seen.
+    fallback_value: Optional[str] = None
+    for match in FALLBACK_RATING_PATTERN.finditer(sanitized_text):
+        if fallback_value is None:
+            fallback_value = match.group(1)
+        elif match.group(1) != fallback_value:
+            return None
+
+    if fallback_value is None:
         if REFUSAL_PATTERN.search(text):
             return "refusal"
         return None
 
-    # If the model enumerates multiple options (e.g., "1..6"), it did not choose one.
-    unique_values = list(dict.fromkeys(fallback_matches))
-    if len(unique_values) > 1:
-        return None
-
     # If response is clearly directed at the user and lacks self-rating language,
-    # treat as no valid decision choice.
-    lower_text = text.lower()
-    has_user_directed = USER_DIRECTED_PATTERN.search(lower_text) is not None
-    has_self_rating = SELF_RATING_PATTERN.search(lower_text) is not None
-    if has_user_directed and not has_self_rating:
-        return None
+    # treat as no valid decision choice. Any self-rating match settles it.
+    # Scan the lowercased text, not just IGNORECASE: str.lower() expands "İ" to
+    # "i" plus a combining dot, which splits words the way the heuristics expect.
+    has_user_directed = False
+    for match in USER_OR_SELF_PATTERN.finditer(text.lower()):
+        if match.group("self") is not None:
+            break
+        has_user_directed = True
+    else:
+        if has_user_directed:
+            return None
+
+    return fallback_value
 
-    return unique_values[0]
+
+@functools.lru_cache(maxsize=4096)
+def _extract_decision_code_from_text_cached(text: str) -> Optional[str]:
+    """extract_decision_code_from_text, memoized: multi-sample runs repeat responses."""
+    return extract_decision_code_from_text(text)
 
 
 def extract_explicit_leading_decision_code(text: str) -> Optional[str]:
@@ -573,19 +630,9 @@ def extract_explicit_leading_decision_code(text: str) -> Optional[str]:
             return None
         return structured_match.group(1)
 
-    for pattern in STRUCTURED_DECISION_PATTERNS:
-        matches = []
-        for match in pattern.finditer(sanitized_markdown_text):
-            suffix = sanitized_markdown_text[match.end():match.end() + 24]
-            if AMBIGUOUS_SUFFIX_PATTERN.search(suffix):
-                return None
-            matches.append(match.group(1))
-        if not matches:
-            continue
-        unique_values = list(dict.fromkeys(matches))
-        if len(unique_values) == 1:
-            return unique_values[0]
-        return None
+    matched, decision_value = _match_structured_decision(sanitized_markdown_text)
+    if matched:
+        return decision_value
 
     bare_number_match = LEADING_BARE_NUMBER_PATTERN.match(sanitized_markdown_text)
     if bare_number_match:
@@ -608,12 +655,12 @@ def extract_decision_code(transcript_content: dict[str, Any]) -> str:
     """
     turns = transcript_content.get("turns", [])
 
-    # Combine all target responses
-    full_text = ""
-    for turn in turns:
-        response = turn.get("targetResponse", "")
-        if response:
-            full_text += response + "\n"
+    # Combine all non-empty target responses, each followed by a newline
+    responses = [turn.get("targetResponse", "") for turn in turns]
+    responses = [response for response in responses if response]
+    if not responses:
+        return "other"
+    full_text = "\n".join(responses) + "\n"
 
-    result = extract_decision_code_from_text(full_text)
+    result = _extract_decision_code_from_text_cached(full_text)
     return result if result else "other"
@@ -16,6 +16,9 @@ DEFAULT_SUMMARY_MODEL = "anthropic:claude-sonnet-4-20250514"
 
 LLM_FALLBACK_MODEL = "xai:grok-4-1-fast-reasoning"
 
+# First positive integer in the classifier's reply
+LLM_NUMERIC_PATTERN = re.compile(r"\b([1-9]\d*)\b")
+
 
 def build_llm_decision_prompt(
     transcript_content: dict[str, Any], scale_labels: Optional[list[dict[str, str]]] = None
@@ -81,7 +84,7 @@ def classify_decision_with_llm(
             return "refusal"
         if normalized == "other":
             return "other"
-        numeric_match = re.search(r"\b([1-9]\d*)\b", normalized)
+        numeric_match = LLM_NUMERIC_PATTERN.search(normalized)
         if numeric_match:
             return numeric_match.group(1)
         return "other"
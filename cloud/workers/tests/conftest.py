@@ -5,11 +5,13 @@ Provides mock fixtures for HTTP calls and LLM responses.
 """
 
 import json
-from typing import Any
+from typing import Any, Optional
 from unittest.mock import MagicMock
 
 import pytest
 
+from common.llm_adapters.circuit_breaker import reset_circuit_breakers
+
 
 class MockResponse:
     """Mock HTTP response for testing."""
@@ -19,15 +21,30 @@ class MockResponse:
         json_data: dict[str, Any],
         status_code: int = 200,
         text: str = "",
+        headers: Optional[dict[str, str]] = None,
     ):
         self._json_data = json_data
         self.status_code = status_code
         self.text = text or json.dumps(json_data)
+        self.headers = headers or {}
+        self.encoding = "utf-8"
+
+    @property
+    def content(self) -> bytes:
+        return self.text.encode()
 
     def json(self) -> dict[str, Any]:
         return self._json_data
 
 
+@pytest.fixture(autouse=True)
+def _reset_circuit_breakers():
+    """Keep provider circuit-breaker state from leaking between tests."""
+    reset_circuit_breakers()
+    yield
+    reset_circuit_breakers()
+
+
 @pytest.fixture
 def mock_openai_response() -> dict[str, Any]:
     """Standard OpenAI API response."""
@@ -177,7 +194,7 @@ def mock_env_no_keys(monkeypatch: pytest.MonkeyPatch) -> None:
 
 
 def create_mock_post(response: dict[str, Any], status_code: int = 200) -> MagicMock:
-    """Create a mock for requests.post that returns the given response."""
+    """Create a mock for the shared session's post() that returns the given response."""
     mock_response = MockResponse(response, status_code)
     mock_post = MagicMock(return_value=mock_response)
     return mock_post
@@ -7,7 +7,9 @@ Tests the full analysis pipeline with realistic transcript data.
 import json
 import subprocess
 import sys
+from io import StringIO
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -15,21 +17,16 @@ WORKERS_DIR = Path(__file__).parent.parent
 if str(WORKERS_DIR) not in sys.path:
     sys.path.insert(0, str(WORKERS_DIR))
 
+import analyze_basic
 from stats.preference_stats import compute_two_step_by_value as _compute_two_step_by_value
 
 
 def run_analyze_basic(input_data: dict) -> dict:
-    """Run analyze_basic.py with given input and return output."""
-    workers_dir = Path(__file__).parent.parent
-    result = subprocess.run(
-        [sys.executable, "analyze_basic.py"],
-        input=json.dumps(input_data),
-        capture_output=True,
-        text=True,
-        cwd=workers_dir,
-        env={**dict(__import__("os").environ), "PYTHONPATH": str(workers_dir)},
-    )
-    return json.loads(result.stdout)
+    """Run the analyze_basic worker in-process with given input and return output."""
+    with patch("sys.stdin", StringIO(json.dumps(input_data))):
+        with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            analyze_basic.main()
+    return json.loads(mock_stdout.getvalue())
 
 
 class TestAnalyzeBasicIntegration:
@@ -941,7 +938,7 @@ class TestAnalyzeBasicIntegration:
         assert "runId" in result["error"]["message"]
 
     def test_invalid_json(self):
-        """Test error handling for invalid JSON."""
+        """Test error handling for invalid JSON, through the CLI entry point."""
         workers_dir = Path(__file__).parent.parent
         result = subprocess.run(
             [sys.executable, "analyze_basic.py"],
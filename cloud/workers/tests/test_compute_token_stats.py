@@ -12,10 +12,12 @@ from unittest.mock import patch
 from compute_token_stats import (
     compute_new_average,
     group_probes_by_model,
+    summarize_probes_by_model,
     compute_stats,
     validate_input,
     main,
     EMA_ALPHA,
+    NUMPY_MIN_PROBES,
 )
 from common.errors import ValidationError
 
@@ -118,6 +120,46 @@ class TestGroupProbesByModel:
         assert grouped == {}
 
 
+class TestSummarizeProbesByModel:
+    """Tests for per-model token aggregation."""
+
+    def test_small_batch_matches_grouping(self):
+        """Small batches report count and means per model in first-seen order."""
+        probes = [
+            {"modelId": "gpt-4", "inputTokens": 100, "outputTokens": 500},
+            {"modelId": "claude-3", "inputTokens": 200, "outputTokens": 800},
+            {"modelId": "gpt-4", "inputTokens": 150, "outputTokens": 600},
+        ]
+        summary = summarize_probes_by_model(probes)
+
+        assert list(summary) == ["gpt-4", "claude-3"]
+        assert summary["gpt-4"] == (2, 125.0, 550.0)
+        assert summary["claude-3"] == (1, 200.0, 800.0)
+
+    def test_large_batch_matches_python_aggregation(self):
+        """The NumPy path gives the same counts, means and order as plain Python."""
+        models = ["m-b", "m-a", "m-c"]
+        probes = []
+        for i in range(NUMPY_MIN_PROBES * 2):
+            probes.append({
+                "modelId": models[i % 3],
+                "inputTokens": (i * 37) % 1000,
+                "outputTokens": (i * 91) % 5000,
+            })
+        probes.append({"modelId": "m-a", "inputTokens": None, "outputTokens": 5})
+        probes.append({"inputTokens": 1, "outputTokens": 5})
+
+        summary = summarize_probes_by_model(probes)
+        grouped = group_probes_by_model(probes)
+
+        assert list(summary) == list(grouped)
+        for model_id, tokens in grouped.items():
+            count, avg_input, avg_output = summary[model_id]
+            assert count == len(tokens["input"])
+            assert avg_input == sum(tokens["input"]) / len(tokens["input"])
+            assert avg_output == sum(tokens["output"]) / len(tokens["output"])
+
+
 class TestComputeStats:
     """Tests for overall stats computation."""
 
@@ -112,6 +112,21 @@ class TestFillTemplate:
         result = fill_template(template, combo, dim_map)
         assert "Result: wings" in result
 
+    def test_repeated_score_reference_uses_one_option(self) -> None:
+        """Test that every reference to one score in a template gets the same option."""
+        dim = Dimension(
+            name="Freedom",
+            levels=[DimensionLevel(score=5, label="Free", options=[f"opt{i}" for i in range(20)])],
+        )
+        combo = [{"name": "Freedom", "level": dim.levels[0]}]
+        template = "[Freedom_Score5]|[Freedom_Score5]\n5 - [Freedom]"
+
+        for _ in range(10):
+            result = fill_template(template, combo, {"Freedom": dim})
+            head, tail = result.split("|")
+            middle, scale = tail.split("\n5 - ")
+            assert head == middle == scale
+
     def test_regex_edge_cases(self, dim_freedom: Dimension) -> None:
         """Test various regex edge cases for context awareness."""
         dim_map = {"Freedom": dim_freedom}
@@ -178,6 +193,29 @@ class TestRunGeneration:
         assert "D1_2 / D2_1" in names
         assert "D1_2 / D2_2" in names
 
+    def test_option_choice_is_reproducible(self) -> None:
+        """Test that regenerating a definition picks the same options."""
+        data = {
+            "definitionId": "def-123",
+            "content": {
+                "template": "[D1] / [D1_Score2]",
+                "dimensions": [
+                    {
+                        "name": "D1",
+                        "levels": [
+                            {"score": 1, "label": "a", "options": ["a1", "a2", "a3", "a4"]},
+                            {"score": 2, "label": "b", "options": ["b1", "b2", "b3", "b4"]},
+                        ],
+                    }
+                ],
+            },
+        }
+
+        first = run_generation(data)
+        second = run_generation(data)
+
+        assert first["scenarios"] == second["scenarios"]
+
     def test_validate_input(self) -> None:
         """Test validation."""
         with pytest.raises(ValidationError):
@@ -0,0 +1,55 @@
+"""Tests for the worker JSON stdin/stdout codec."""
+
+import io
+import json
+import math
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from common import json_io
+
+
+class TestLoads:
+    """Tests for loads."""
+
+    def test_lone_surrogate_escape(self) -> None:
+        """A truncated emoji escape (as JSON.stringify writes it) still decodes."""
+        assert json_io.loads(b'{"a": "x\\ud83d"}') == {"a": "x\ud83d"}
+
+    def test_non_finite_numbers(self) -> None:
+        """NaN and Infinity are accepted, as with the stdlib decoder."""
+        result = json_io.loads(b'{"a": NaN, "b": Infinity}')
+
+        assert math.isnan(result["a"])
+        assert result["b"] == float("inf")
+
+    def test_invalid_json_raises(self) -> None:
+        """Malformed input raises json.JSONDecodeError."""
+        with pytest.raises(json.JSONDecodeError):
+            json_io.loads(b'{"a": ')
+
+
+class TestWriteStdout:
+    """Tests for write_stdout."""
+
+    def test_writes_single_json_line(self) -> None:
+        """Output is one newline-terminated JSON document."""
+        out = io.StringIO()
+        with patch("sys.stdout", out):
+            json_io.write_stdout({"success": True, "items": [1, 2]})
+
+        assert out.getvalue().endswith("\n")
+        assert json.loads(out.getvalue()) == {"success": True, "items": [1, 2]}
+
+    def test_serializes_numpy_scalars(self) -> None:
+        """NumPy scalars from analysis results encode as plain numbers."""
+        if json_io.orjson is None:
+            pytest.skip("orjson not installed")
+
+        out = io.StringIO()
+        with patch("sys.stdout", out):
+            json_io.write_stdout({"mean": np.float64(0.5), "count": np.int64(3)})
+
+        assert json.loads(out.getvalue()) == {"mean": 0.5, "count": 3}
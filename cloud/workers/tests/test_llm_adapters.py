@@ -1,5 +1,7 @@
 """Tests for LLM adapters with mocked HTTP calls."""
 
+import json
+import time
 from typing import Any
 from unittest.mock import MagicMock, patch
 
@@ -15,10 +17,16 @@ from common.llm_adapters import (
     MistralAdapter,
     OpenAIAdapter,
     XAIAdapter,
+    _post_json,
     generate,
     infer_provider,
     resolve_max_tokens,
 )
+from common.llm_adapters.constants import (
+    CIRCUIT_BREAKER_COOLDOWN_SECONDS,
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+    MAX_RATE_LIMIT_RETRIES,
+)
 
 from .conftest import MockResponse
 
@@ -83,7 +91,7 @@ class TestOpenAIAdapter:
         mock_openai_response: dict[str, Any],
     ) -> None:
         """Test successful generation."""
-        with patch("requests.post") as mock_post:
+        with patch("common.llm_adapters.base._SESSION.post") as mock_post:
             mock_post.return_value = MockResponse(mock_openai_response, 200)
 
             result = adapter.generate(
@@ -114,7 +122,8 @@ class TestOpenAIAdapter:
 
     def test_rate_limit_error(self, adapter: OpenAIAdapter) -> None:
         """Test rate limit error handling."""
-        with patch("requests.post") as mock_post:
+        with patch("common.llm_adapters.base._SESSION.post") as mock_post, \
+                patch("common.llm_adapters.base.time.sleep") as mock_sleep:
             mock_post.return_value = MockResponse(
                 {"error": "Rate limited"},
                 status_code=429,
@@ -126,6 +135,7 @@ class TestOpenAIAdapter:
 
             assert exc_info.value.code == ErrorCode.RATE_LIMIT
             assert exc_info.value.retryable
+            assert mock_sleep.call_count == MAX_RATE_LIMIT_RETRIES
 
 
 class TestAnthropicAdapter:
@@ -142,7 +152,7 @@ class TestAnthropicAdapter:
         mock_anthropic_response: dict[str, Any],
     ) -> None:
         """Test successful generation."""
-        with patch("requests.post") as mock_post:
+        with patch("common.llm_adapters.base._SESSION.post") as mock_post:
             mock_post.return_value = MockResponse(mock_anthropic_response, 200)
 
             result = adapter.generate(
@@ -160,7 +170,7 @@ class TestAnthropicAdapter:
         mock_anthropic_response: dict[str, Any],
     ) -> None:
         """Test that system messages are properly extracted."""
-        with patch("requests.post") as mock_post:
+        with patch("common.llm_adapters.base._SESSION.post") as mock_post:
             mock_post.return_value = MockResponse(mock_anthropic_response, 200)
 
             adapter.generate(
@@ -192,7 +202,7 @@ class TestGeminiAdapter:
         mock_gemini_response: dict[str, Any],
     ) -> None:
         """Test successful generation."""
-        with patch("requests.post") as mock_post:
+        with patch("common.llm_adapters.base._SESSION.post") as mock_post:
             mock_post.return_value = MockResponse(mock_gemini_response, 200)
 
             result = adapter.generate(
@@ -219,7 +229,7 @@ class TestXAIAdapter:
         mock_openai_compatible_response: dict[str, Any],
     ) -> None:
         """Test successful generation."""
-        with patch("requests.post") as mock_post:
+        with patch("common.llm_adapters.base._SESSION.post") as mock_post:
             mock_post.return_value = MockResponse(mock_openai_compatible_response, 200)
 
             result = adapter.generate(
@@ -245,7 +255,7 @@ class TestDeepSeekAdapter:
         mock_openai_compatible_response: dict[str, Any],
     ) -> None:
         """Test successful generation."""
-        with patch("requests.post") as mock_post:
+        with patch("common.llm_adapters.base._SESSION.post") as mock_post:
             mock_post.return_value = MockResponse(mock_openai_compatible_response, 200)
 
             result = adapter.generate(
@@ -261,7 +271,7 @@ class TestDeepSeekAdapter:
         mock_openai_compatible_response: dict[str, Any],
     ) -> None:
         """Test that max_tokens is capped at 64K (DeepSeek API limit)."""
-        with patch("requests.post") as mock_post:
+        with patch("common.llm_adapters.base._SESSION.post") as mock_post:
             mock_post.return_value = MockResponse(mock_openai_compatible_response, 200)
 
             adapter.generate(
@@ -290,7 +300,7 @@ class TestMistralAdapter:
         mock_openai_compatible_response: dict[str, Any],
     ) -> None:
         """Test successful generation."""
-        with patch("requests.post") as mock_post:
+        with patch("common.llm_adapters.base._SESSION.post") as mock_post:
             mock_post.return_value = MockResponse(mock_openai_compatible_response, 200)
 
             result = adapter.generate(
@@ -335,7 +345,8 @@ class TestErrorHandling:
         monkeypatch.setenv("OPENAI_API_KEY", "test-key")
         adapter = OpenAIAdapter(api_key="test-key")
 
-        with patch("requests.post") as mock_post:
+        with patch("common.llm_adapters.base._SESSION.post") as mock_post, \
+                patch("common.llm_adapters.base.time.sleep"):
             mock_post.side_effect = requests.Timeout("Connection timed out")
 
             with pytest.raises(LLMError) as exc_info:
@@ -349,7 +360,8 @@ class TestErrorHandling:
         monkeypatch.setenv("OPENAI_API_KEY", "test-key")
         adapter = OpenAIAdapter(api_key="test-key")
 
-        with patch("requests.post") as mock_post:
+        with patch("common.llm_adapters.base._SESSION.post") as mock_post, \
+                patch("common.llm_adapters.base.time.sleep"):
             mock_post.side_effect = requests.ConnectionError("Connection refused")
 
             with pytest.raises(LLMError) as exc_info:
@@ -363,7 +375,7 @@ class TestErrorHandling:
         monkeypatch.setenv("OPENAI_API_KEY", "test-key")
         adapter = OpenAIAdapter(api_key="test-key")
 
-        with patch("requests.post") as mock_post:
+        with patch("common.llm_adapters.base._SESSION.post") as mock_post:
             mock_post.return_value = MockResponse(
                 {"error": "Invalid key"},
                 status_code=401,
@@ -376,6 +388,141 @@ class TestErrorHandling:
             assert exc_info.value.code == ErrorCode.AUTH_ERROR
             assert not exc_info.value.retryable
 
+    def test_lone_surrogate_body_decodes(self) -> None:
+        """Test that bodies orjson rejects fall back to response.json()."""
+        text = '{"data": "x\\ud83d"}'
+        with patch("common.llm_adapters.base._SESSION.post") as mock_post:
+            mock_post.return_value = MockResponse(json.loads(text), 200, text=text)
+            assert _post_json("https://api.example.com/v1/chat", {}, {"model": "m1"}) == {"data": "x\ud83d"}
+
+    def test_undecodable_body_is_invalid_response(self) -> None:
+        """Test that a body neither decoder accepts raises INVALID_RESPONSE."""
+        response = MagicMock(status_code=200, content=b"<html>oops</html>")
+        response.json.side_effect = ValueError("Expecting value")
+        with patch("common.llm_adapters.base._SESSION.post", return_value=response):
+            with pytest.raises(LLMError) as exc_info:
+                _post_json("https://api.example.com/v1/chat", {}, {"model": "m1"})
+
+        assert exc_info.value.code == ErrorCode.INVALID_RESPONSE
+        assert not exc_info.value.retryable
+
+
+class TestCircuitBreaker:
+    """Tests for the per-(host, model) circuit breaker in post_json."""
+
+    URL = "https://api.example.com/v1/chat"
+
+    def _fail_until_open(self) -> None:
+        for _ in range(CIRCUIT_BREAKER_FAILURE_THRESHOLD):
+            with pytest.raises(LLMError):
+                _post_json(self.URL, {}, {"model": "m1"})
+
+    def test_opens_after_consecutive_server_errors(self) -> None:
+        """Test that the breaker short-circuits once the threshold is reached."""
+        with patch("common.llm_adapters.base._SESSION.post") as mock_post:
+            mock_post.return_value = MockResponse({"error": "down"}, status_code=503, text="Service Unavailable")
+            self._fail_until_open()
+            assert mock_post.call_count == CIRCUIT_BREAKER_FAILURE_THRESHOLD
+
+            with pytest.raises(LLMError) as exc_info:
+                _post_json(self.URL, {}, {"model": "m1"})
+
+            assert mock_post.call_count == CIRCUIT_BREAKER_FAILURE_THRESHOLD
+            assert exc_info.value.code == ErrorCode.SERVER_ERROR
+            assert exc_info.value.retryable
+
+    def test_breaker_is_keyed_by_model(self) -> None:
+        """Test that an open breaker for one model does not block another."""
+        with patch("common.llm_adapters.base._SESSION.post") as mock_post:
+            mock_post.return_value = MockResponse({"error": "down"}, status_code=503, text="Service Unavailable")
+            self._fail_until_open()
+
+            mock_post.return_value = MockResponse({"data": "ok"}, 200)
+            assert _post_json(self.URL, {}, {"model": "m2"}) == {"data": "ok"}
+
+    def test_half_open_probe_closes_breaker(self) -> None:
+        """Test that a successful probe after the cooldown closes the breaker."""
+        with patch("common.llm_adapters.base._SESSION.post") as mock_post:
+            mock_post.return_value = MockResponse({"error": "down"}, status_code=503, text="Service Unavailable")
+            self._fail_until_open()
+
+            mock_post.return_value = MockResponse({"data": "ok"}, 200)
+            with patch(
+                "common.llm_adapters.circuit_breaker.time.monotonic",
+                return_value=time.monotonic() + CIRCUIT_BREAKER_COOLDOWN_SECONDS + 1,
+            ):
+                assert _post_json(self.URL, {}, {"model": "m1"}) == {"data": "ok"}
+            assert _post_json(self.URL, {}, {"model": "m1"}) == {"data": "ok"}
+
+    def test_rate_limited_server_errors_do_not_open(self) -> None:
+        """Test that 5xx responses carrying rate-limit text are not counted."""
+        throttled = MockResponse({"error": "busy"}, status_code=503, text="Rate limit exceeded, slow down")
+        with patch("common.llm_adapters.base._SESSION.post") as mock_post, \
+                patch("common.llm_adapters.base.time.sleep"):
+            mock_post.return_value = throttled
+            with pytest.raises(LLMError) as exc_info:
+                _post_json(self.URL, {}, {"model": "m1"})
+            assert exc_info.value.code == ErrorCode.RATE_LIMIT
+            assert mock_post.call_count == MAX_RATE_LIMIT_RETRIES + 1
+
+            mock_post.return_value = MockResponse({"data": "ok"}, 200)
+            assert _post_json(self.URL, {}, {"model": "m1"}) == {"data": "ok"}
+
+    def test_success_resets_failure_count(self) -> None:
+        """Test that only consecutive failures count toward opening."""
+        failure = MockResponse({"error": "down"}, status_code=503, text="Service Unavailable")
+        success = MockResponse({"data": "ok"}, 200)
+        responses = [failure] * (CIRCUIT_BREAKER_FAILURE_THRESHOLD - 1) + [success, failure, success]
+
+        with patch("common.llm_adapters.base._SESSION.post", side_effect=responses):
+            for response in responses:
+                if response is success:
+                    assert _post_json(self.URL, {}, {"model": "m1"}) == {"data": "ok"}
+                else:
+                    with pytest.raises(LLMError) as exc_info:
+                        _post_json(self.URL, {}, {"model": "m1"})
+                    assert "Circuit open" not in exc_info.value.message
+
+
+class TestIdempotencyKey:
+    """Tests for the Idempotency-Key header sent by post_json."""
+
+    URL = "https://api.example.com/v1/chat"
+
+    def test_key_is_reused_across_retries(self) -> None:
+        """Test that a retry after a timeout resends the same key."""
+        responses = [requests.exceptions.Timeout("timed out"), MockResponse({"data": "ok"}, 200)]
+
+        with patch("common.llm_adapters.base._SESSION.post", side_effect=responses) as mock_post, \
+                patch("common.llm_adapters.base.time.sleep"):
+            result = _post_json(self.URL, {"Authorization": "Bearer k"}, {"model": "m1"}, idempotency_key="abc")
+
+        assert result == {"data": "ok"}
+        sent = [call.kwargs["headers"] for call in mock_post.call_args_list]
+        assert [h["Idempotency-Key"] for h in sent] == ["abc", "abc"]
+        assert sent[0]["Authorization"] == "Bearer k"
+
+    def test_no_header_without_key(self) -> None:
+        """Test that callers without a key send their headers unchanged."""
+        headers = {"Authorization": "Bearer k"}
+        with patch("common.llm_adapters.base._SESSION.post") as mock_post:
+            mock_post.return_value = MockResponse({"data": "ok"}, 200)
+            _post_json(self.URL, headers, {"model": "m1"})
+
+        assert mock_post.call_args.kwargs["headers"] == {"Authorization": "Bearer k"}
+
+    def test_adapter_sends_key(self, mock_openai_response: dict) -> None:
+        """Test that adapters attach a fresh key to each generate call."""
+        adapter = OpenAIAdapter(api_key="test-key")
+        with patch("common.llm_adapters.base._SESSION.post") as mock_post:
+            mock_post.return_value = MockResponse(mock_openai_response)
+            adapter.generate("gpt-4", [{"role": "user", "content": "Hi"}])
+            adapter.generate("gpt-4", [{"role": "user", "content": "Hi"}])
+
+        keys = [call.kwargs["headers"]["Idempotency-Key"] for call in mock_post.call_args_list]
+        assert len(keys) == 2
+        assert keys[0] != keys[1]
+
 
 class TestResolveMaxTokens:
     """Tests for resolve_max_tokens helper function."""
@@ -429,7 +576,7 @@ class TestMaxTokensConfig:
         monkeypatch.setenv("OPENAI_API_KEY", "test-key")
         adapter = OpenAIAdapter(api_key="test-key")
 
-        with patch("requests.post") as mock_post:
+        with patch("common.llm_adapters.base._SESSION.post") as mock_post:
             mock_post.return_value = MockResponse(mock_openai_response, 200)
 
             adapter.generate(
@@ -448,7 +595,7 @@ class TestMaxTokensConfig:
         monkeypatch.setenv("OPENAI_API_KEY", "test-key")
         adapter = OpenAIAdapter(api_key="test-key")
 
-        with patch("requests.post") as mock_post:
+        with patch("common.llm_adapters.base._SESSION.post") as mock_post:
             mock_post.return_value = MockResponse(mock_openai_response, 200)
 
             adapter.generate(
@@ -471,7 +618,7 @@ class TestMaxTokensConfig:
             "usageMetadata": {"promptTokenCount": 10, "candidatesTokenCount": 5},
         }
 
-        with patch("requests.post") as mock_post:
+        with patch("common.llm_adapters.base._SESSION.post") as mock_post:
             mock_post.return_value = MockResponse(mock_response, 200)
 
             adapter.generate(
@@ -493,7 +640,7 @@ class TestMaxTokensConfig:
             "usageMetadata": {"promptTokenCount": 10, "candidatesTokenCount": 5},
         }
 
-        with patch("requests.post") as mock_post:
+        with patch("common.llm_adapters.base._SESSION.post") as mock_post:
             mock_post.return_value = MockResponse(mock_response, 200)
 
             adapter.generate(
@@ -517,7 +664,7 @@ class TestMaxTokensConfig:
             "usage": {"input_tokens": 10, "output_tokens": 5},
         }
 
-        with patch("requests.post") as mock_post:
+        with patch("common.llm_adapters.base._SESSION.post") as mock_post:
             mock_post.return_value = MockResponse(mock_response, 200)
 
             adapter.generate(
@@ -568,7 +715,7 @@ class TestEmptyContentRaises:
         """Reproduces the production bug: completion_tokens=513, reasoning_tokens=510, content=''."""
         adapter = DeepSeekAdapter(api_key="test-key")
 
-        with patch("requests.post") as mock_post:
+        with patch("common.llm_adapters.base._SESSION.post") as mock_post:
             mock_post.return_value = MockResponse(
                 _openai_compat_response("", completion_tokens=513, reasoning_tokens=510),
                 200,
@@ -585,7 +732,7 @@ class TestEmptyContentRaises:
         """null content (vs empty string) should also raise."""
         adapter = DeepSeekAdapter(api_key="test-key")
 
-        with patch("requests.post") as mock_post:
+        with patch("common.llm_adapters.base._SESSION.post") as mock_post:
             mock_post.return_value = MockResponse(
                 _openai_compat_response(None, completion_tokens=400),
                 200,
@@ -600,7 +747,7 @@ class TestEmptyContentRaises:
         """Whitespace-only content cannot drive a canonical decision; should raise."""
         adapter = DeepSeekAdapter(api_key="test-key")
 
-        with patch("requests.post") as mock_post:
+        with patch("common.llm_adapters.base._SESSION.post") as mock_post:
             mock_post.return_value = MockResponse(
                 _openai_compat_response("   \n\t  ", completion_tokens=200),
                 200,
@@ -615,7 +762,7 @@ class TestEmptyContentRaises:
         """Reproduces the grok-4-0709 failure: completion_tokens=0, finish_reason=''."""
         adapter = XAIAdapter(api_key="test-key")
 
-        with patch("requests.post") as mock_post:
+        with patch("common.llm_adapters.base._SESSION.post") as mock_post:
             mock_post.return_value = MockResponse(
                 _openai_compat_response("", completion_tokens=0, finish_reason=""),
                 200,
@@ -631,7 +778,7 @@ class TestEmptyContentRaises:
     def test_openai_empty_content_raises(self) -> None:
         adapter = OpenAIAdapter(api_key="test-key")
 
-        with patch("requests.post") as mock_post:
+        with patch("common.llm_adapters.base._SESSION.post") as mock_post:
             mock_post.return_value = MockResponse(
                 _openai_compat_response("", completion_tokens=42),
                 200,
@@ -645,7 +792,7 @@ class TestEmptyContentRaises:
     def test_mistral_empty_content_raises(self) -> None:
         adapter = MistralAdapter(api_key="test-key")
 
-        with patch("requests.post") as mock_post:
+        with patch("common.llm_adapters.base._SESSION.post") as mock_post:
             mock_post.return_value = MockResponse(
                 _openai_compat_response("", completion_tokens=42),
                 200,
@@ -660,7 +807,7 @@ class TestEmptyContentRaises:
         """Anthropic returns a content array — empty text parts must also raise."""
         adapter = AnthropicAdapter(api_key="test-key")
 
-        with patch("requests.post") as mock_post:
+        with patch("common.llm_adapters.base._SESSION.post") as mock_post:
             mock_post.return_value = MockResponse(
                 {
                     "id": "msg-empty",
@@ -681,7 +828,7 @@ class TestEmptyContentRaises:
         """Anthropic content array with no text-type parts must raise."""
         adapter = AnthropicAdapter(api_key="test-key")
 
-        with patch("requests.post") as mock_post:
+        with patch("common.llm_adapters.base._SESSION.post") as mock_post:
             mock_post.return_value = MockResponse(
                 {
                     "id": "msg-empty",
@@ -702,7 +849,7 @@ class TestEmptyContentRaises:
         """Sanity: a normal response still succeeds."""
         adapter = DeepSeekAdapter(api_key="test-key")
 
-        with patch("requests.post") as mock_post:
+        with patch("common.llm_adapters.base._SESSION.post") as mock_post:
             mock_post.return_value = MockResponse(
                 _openai_compat_response("Strongly support taking the job", completion_tokens=42),
                 200,
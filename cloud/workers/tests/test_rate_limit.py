@@ -14,10 +14,22 @@ from common.llm_adapters import (
     MAX_RATE_LIMIT_RETRIES,
     RATE_LIMIT_BACKOFF_SECONDS,
 )
+from common.llm_adapters.base import classify_error_response, parse_retry_after
+from common.llm_adapters.constants import MAX_RATE_LIMIT_BACKOFF_SECONDS, RETRY_BACKOFF_SECONDS
 
 from .conftest import MockResponse
 
 
+@pytest.fixture(autouse=True)
+def no_backoff_jitter():
+    """Pin rate-limit jitter to the midpoint of its range so sleeps are exact."""
+    with patch(
+        "common.llm_adapters.base.random.uniform",
+        side_effect=lambda low, high: (low + high) / 2,
+    ) as mock_uniform:
+        yield mock_uniform
+
+
 class TestIsRateLimitResponse:
     """Tests for _is_rate_limit_response helper."""
 
@@ -98,6 +110,54 @@ class TestIsBillingExhaustionResponse:
         ) is False
 
 
+class TestClassifyErrorResponse:
+    """Tests for the single-pass error classifier used by post_json."""
+
+    def test_unambiguous_billing_beats_rate_limit_text(self) -> None:
+        """Test that unambiguous billing markers win over rate-limit text."""
+        text = "Rate limit reached: you exceeded your current quota"
+        assert classify_error_response(429, text) == "billing"
+
+    def test_rate_limit_text_beats_ambiguous_billing(self) -> None:
+        """Test that rate-limit text wins over ambiguous billing markers."""
+        assert classify_error_response(429, "Rate limit: quota exceeded") == "rate_limit"
+
+    def test_ambiguous_billing_without_rate_limit_text(self) -> None:
+        """Test that an ambiguous billing marker alone classifies as billing."""
+        assert classify_error_response(429, "RESOURCE_EXHAUSTED") == "billing"
+
+    def test_overlapping_markers_are_all_seen(self) -> None:
+        """An ambiguous marker overlapping an unambiguous one must not hide it."""
+        text = "rate limit: quota exceeded your current quota"
+        assert classify_error_response(400, text) == "billing"
+
+    def test_plain_errors(self) -> None:
+        """Test status-only classification when no markers are present."""
+        assert classify_error_response(429, "slow down") == "rate_limit"
+        assert classify_error_response(500, "Internal error") == "other"
+
+    def test_error_snippet_is_bounded(self) -> None:
+        """Test that a huge error page is cut to a short snippet."""
+        body = "<html>" + "x" * 100_000 + "</html>"
+        with patch("common.llm_adapters.base._SESSION.post") as mock_post:
+            mock_post.return_value = MockResponse({}, status_code=404, text=body)
+            with pytest.raises(LLMError) as exc_info:
+                _post_json("https://api.example.com", {}, {})
+
+        assert exc_info.value.details == body[:500]
+
+    def test_error_snippet_with_unknown_charset(self) -> None:
+        """Test that an unknown response charset still yields an LLMError."""
+        response = MockResponse({}, status_code=500, text="Internal error")
+        response.encoding = "utf8mb4"
+        with patch("common.llm_adapters.base._SESSION.post") as mock_post:
+            mock_post.return_value = response
+            with pytest.raises(LLMError) as exc_info:
+                _post_json("https://api.example.com", {}, {})
+
+        assert exc_info.value.details == "Internal error"
+
+
 class TestRateLimitRetry:
     """Tests for rate limit retry with exponential backoff."""
 
@@ -119,7 +179,7 @@ class TestRateLimitRetry:
                 return rate_limit_response
             return success_response
 
-        with patch("requests.post", side_effect=mock_post) as mock:
+        with patch("common.llm_adapters.base._SESSION.post", side_effect=mock_post) as mock:
             with patch("time.sleep") as mock_sleep:
                 result = _post_json("http://test", {}, {})
 
@@ -141,7 +201,7 @@ class TestRateLimitRetry:
             text="Rate limit exceeded",
         )
 
-        with patch("requests.post", return_value=rate_limit_response):
+        with patch("common.llm_adapters.base._SESSION.post", return_value=rate_limit_response):
             with patch("time.sleep"):
                 with pytest.raises(LLMError) as exc_info:
                     _post_json("http://test", {}, {})
@@ -166,7 +226,7 @@ class TestRateLimitRetry:
                 return rate_limit_400
             return success_response
 
-        with patch("requests.post", side_effect=mock_post):
+        with patch("common.llm_adapters.base._SESSION.post", side_effect=mock_post):
             with patch("time.sleep") as mock_sleep:
                 result = _post_json("http://test", {}, {})
 
@@ -181,7 +241,7 @@ class TestRateLimitRetry:
             text="insufficient_quota: out of funds for this API key",
         )
 
-        with patch("requests.post", return_value=billing_response) as mock_post:
+        with patch("common.llm_adapters.base._SESSION.post", return_value=billing_response) as mock_post:
             with patch("time.sleep") as mock_sleep:
                 with pytest.raises(LLMError) as exc_info:
                     _post_json("http://test", {}, {})
@@ -200,7 +260,7 @@ class TestRateLimitRetry:
             text="request rejected",
         )
 
-        with patch("requests.post", return_value=ambiguous_response):
+        with patch("common.llm_adapters.base._SESSION.post", return_value=ambiguous_response):
             with patch("time.sleep") as mock_sleep:
                 with pytest.raises(LLMError) as exc_info:
                     _post_json("http://test", {}, {})
@@ -226,7 +286,7 @@ class TestRateLimitRetry:
                 return rate_limit_response
             return success_response
 
-        with patch("requests.post", side_effect=mock_post):
+        with patch("common.llm_adapters.base._SESSION.post", side_effect=mock_post):
             with patch("time.sleep"):
                 with patch("common.llm_adapters.base.log") as mock_log:
                     _post_json("http://test", {}, {})
@@ -267,7 +327,7 @@ class TestRateLimitIntegration:
                 return rate_limit_response
             return success_response
 
-        with patch("requests.post", side_effect=mock_post):
+        with patch("common.llm_adapters.base._SESSION.post", side_effect=mock_post):
             with patch("time.sleep"):
                 result = adapter.generate(
                     "gpt-4",
@@ -288,7 +348,7 @@ class TestRateLimitIntegration:
             text="Rate limit exceeded",
         )
 
-        with patch("requests.post", return_value=rate_limit_response):
+        with patch("common.llm_adapters.base._SESSION.post", return_value=rate_limit_response):
             with patch("time.sleep"):
                 with pytest.raises(LLMError) as exc_info:
                     adapter.generate(
@@ -318,7 +378,7 @@ class TestBackoffConfiguration:
 
         sleep_times: list[int] = []
 
-        with patch("requests.post", return_value=rate_limit_response):
+        with patch("common.llm_adapters.base._SESSION.post", return_value=rate_limit_response):
             with patch("time.sleep") as mock_sleep:
                 mock_sleep.side_effect = lambda t: sleep_times.append(t)
 
@@ -328,3 +388,91 @@ class TestBackoffConfiguration:
                     pass
 
                 assert sleep_times == [30, 60, 90, 120]
+
+
+class TestRetryAfter:
+    """Tests for honoring provider-advertised rate-limit waits."""
+
+    def test_parses_delta_seconds(self) -> None:
+        """Test Retry-After given as a number of seconds."""
+        assert parse_retry_after({"Retry-After": "12"}) == 12.0
+
+    def test_parses_http_date(self) -> None:
+        """Test Retry-After given as an HTTP-date."""
+        with patch("common.llm_adapters.base.datetime") as mock_datetime:
+            from datetime import datetime, timezone
+
+            mock_datetime.now.return_value = datetime(2025, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+            assert parse_retry_after({"Retry-After": "Wed, 01 Jan 2025 12:00:45 GMT"}) == 45.0
+
+    def test_past_http_date_means_no_wait(self) -> None:
+        """Test that an HTTP-date in the past yields a zero wait."""
+        assert parse_retry_after({"Retry-After": "Wed, 01 Jan 2020 00:00:00 GMT"}) == 0.0
+
+    def test_falls_back_to_ratelimit_reset_headers(self) -> None:
+        """Test OpenAI-style reset durations, taking the longer one."""
+        headers = {
+            "x-ratelimit-reset-requests": "1m30s",
+            "x-ratelimit-reset-tokens": "250ms",
+        }
+        assert parse_retry_after(headers) == 90.0
+
+    def test_no_headers(self) -> None:
+        """Test that missing or unparseable headers yield None."""
+        assert parse_retry_after({}) is None
+        assert parse_retry_after({"Retry-After": "soon"}) is None
+
+    def test_post_json_sleeps_for_retry_after(self) -> None:
+        """Test that an advertised wait replaces the static backoff table."""
+        responses = [
+            MockResponse(
+                {"error": "Rate limit"},
+                status_code=429,
+                text="Rate limit exceeded",
+                headers={"Retry-After": "5"},
+            ),
+            MockResponse({"data": "success"}, 200),
+        ]
+
+        with patch("common.llm_adapters.base._SESSION.post", side_effect=responses):
+            with patch("time.sleep") as mock_sleep:
+                assert _post_json("http://test", {}, {}) == {"data": "success"}
+
+        # Advertised waits are only stretched by jitter (midpoint of 1.0-1.2)
+        assert mock_sleep.call_args == call(pytest.approx(5.5))
+
+    def test_zero_retry_after_waits_base_backoff(self) -> None:
+        """Test that a zero advertised wait still backs off before retrying."""
+        responses = [
+            MockResponse(
+                {"error": "Rate limit"},
+                status_code=429,
+                text="Rate limit exceeded",
+                headers={"Retry-After": "0"},
+            ),
+            MockResponse({"data": "success"}, 200),
+        ]
+
+        with patch("common.llm_adapters.base._SESSION.post", side_effect=responses):
+            with patch("time.sleep") as mock_sleep:
+                assert _post_json("http://test", {}, {}) == {"data": "success"}
+
+        assert mock_sleep.call_args == call(pytest.approx(RETRY_BACKOFF_SECONDS * 1.1))
+
+    def test_retry_after_is_capped(self) -> None:
+        """Test that very long advertised waits are bounded."""
+        responses = [
+            MockResponse(
+                {"error": "Rate limit"},
+                status_code=429,
+                text="Rate limit exceeded",
+                headers={"Retry-After": "86400"},
+            ),
+            MockResponse({"data": "success"}, 200),
+        ]
+
+        with patch("common.llm_adapters.base._SESSION.post", side_effect=responses):
+            with patch("time.sleep") as mock_sleep:
+                _post_json("http://test", {}, {})
+
+        mock_sleep.assert_called_once_with(MAX_RATE_LIMIT_BACKOFF_SECONDS)
@@ -7,9 +7,10 @@ Coherence ingredients that the Models / Consistency report reads.
 """
 
 import json
-import subprocess
 import sys
+from io import StringIO
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -17,19 +18,15 @@ WORKERS_DIR = Path(__file__).parent.parent
 if str(WORKERS_DIR) not in sys.path:
     sys.path.insert(0, str(WORKERS_DIR))
 
+import analyze_basic
+
 
 def run_analyze_basic(input_data: dict) -> dict:
-    """Run analyze_basic.py with given input and return output."""
-    workers_dir = Path(__file__).parent.parent
-    result = subprocess.run(
-        [sys.executable, "analyze_basic.py"],
-        input=json.dumps(input_data),
-        capture_output=True,
-        text=True,
-        cwd=workers_dir,
-        env={**dict(__import__("os").environ), "PYTHONPATH": str(workers_dir)},
-    )
-    return json.loads(result.stdout)
+    """Run the analyze_basic worker in-process with given input and return output."""
+    with patch("sys.stdin", StringIO(json.dumps(input_data))):
+        with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            analyze_basic.main()
+    return json.loads(mock_stdout.getvalue())
 
 
 class TestReliabilityConsistencyEmission:
@@ -222,6 +222,9 @@ class TestExtractDecisionCodeFromText:
         # Directed at user, BUT with self-rating = OK
         assert extract_decision_code_from_text("You asked for my opinion, I choose 4") == "4"
         assert extract_decision_code_from_text("Personally, I think 3, but what do you think?") == "3"
+        assert extract_decision_code_from_text("My pick is clear: 4. Would you agree?") == "4"
+        # str.lower() splits "İN" into "i" + combining dot + "n", leaving a standalone "i"
+        assert extract_decision_code_from_text("What do you think? İN short: 4") == "4"
 
     def test_numeric_with_embedded_second_person_from_prompt(self) -> None:
         """Test that echoed scenario wording with 'your' does not force 'other'."""
@@ -296,6 +299,7 @@ class TestExtractDecisionCodeFromText:
 
         assert extract_decision_code_from_text("") is None
         assert extract_decision_code_from_text(None) is None  # type: ignore
+        assert extract_decision_code_from_text(" \n\t ") is None
 
 
 class TestLeadingDecisionHelpers:
@@ -483,6 +487,17 @@ class TestExtractDecisionCode:
         result = extract_decision_code(content)
         assert result == "5"
 
+    def test_repeated_response_is_parsed_once(self) -> None:
+        """Test identical responses across samples reuse the cached parse."""
+        from summarize import extract_decision_code
+        from summarize_extract import _extract_decision_code_from_text_cached
+
+        content = {"turns": [{"targetResponse": "Sample response: I choose 2"}]}
+        _extract_decision_code_from_text_cached.cache_clear()
+
+        assert [extract_decision_code(content) for _ in range(3)] == ["2", "2", "2"]
+        assert _extract_decision_code_from_text_cached.cache_info().hits == 2
+
 
 class TestBuildLlmDecisionPrompt:
     """Tests for LLM fallback prompt building."""
@@ -1801,10 +1816,10 @@ class TestMain:
         """Test successful main execution."""
         from summarize_batch import main
 
-        mock_stdin.read.return_value = json.dumps({
+        mock_stdin.buffer.read.return_value = json.dumps({
             "transcriptId": "transcript-123",
             "transcriptContent": {"turns": []},
-        })
+        }).encode()
         mock_run.return_value = {
             "success": True,
             "summary": {"decisionCode": "4", "decisionText": "Summary"},
@@ -1823,7 +1838,7 @@ class TestMain:
         """Test handling of empty input."""
         from summarize_batch import main
 
-        mock_stdin.read.return_value = ""
+        mock_stdin.buffer.read.return_value = b""
 
         main()
 
@@ -1839,7 +1854,7 @@ class TestMain:
         """Test handling of invalid JSON."""
         from summarize_batch import main
 
-        mock_stdin.read.return_value = "not valid json {"
+        mock_stdin.buffer.read.return_value = b"not valid json {"
 
         main()
 
@@ -1855,10 +1870,10 @@ class TestMain:
         """Test handling of validation error."""
         from summarize_batch import main
 
-        mock_stdin.read.return_value = json.dumps({
+        mock_stdin.buffer.read.return_value = json.dumps({
             "transcriptId": "t-123",
             # Missing transcriptContent
-        })
+        }).encode()
 
         main()
 
@@ -1875,7 +1890,7 @@ class TestMain:
         """Test batch execution path."""
         from summarize_batch import main
 
-        mock_stdin.read.return_value = json.dumps({
+        mock_stdin.buffer.read.return_value = json.dumps({
             "transcripts": [
                 {
                     "transcriptId": "transcript-1",
@@ -1888,7 +1903,7 @@ class TestMain:
                     "transcriptContent": {"turns": []},
                 },
             ]
-        })
+        }).encode()
         mock_run_batch.return_value = {
             "success": True,
             "summaries": [
@@ -1930,9 +1945,9 @@ class TestMain:
         """Test malformed batch envelopes stay in batch mode."""
         from summarize_batch import main
 
-        mock_stdin.read.return_value = json.dumps({
+        mock_stdin.buffer.read.return_value = json.dumps({
             "transcripts": "not-a-list",
-        })
+        }).encode()
 
         main()
 
@@ -1948,11 +1963,11 @@ class TestMain:
         """Test that mixed batch and single envelopes fail fast."""
         from summarize_batch import main
 
-        mock_stdin.read.return_value = json.dumps({
+        mock_stdin.buffer.read.return_value = json.dumps({
             "transcriptId": "transcript-123",
             "transcriptContent": {"turns": []},
             "transcripts": [],
-        })
+        }).encode()
 
         main()
 
@@ -1,5 +1,7 @@
 """Tests for variance analysis module."""
 
+import statistics
+
 import pytest
 from stats.variance_analysis import (
     compute_variance_stats,
@@ -8,6 +10,7 @@ from stats.variance_analysis import (
     VarianceStats,
     ModelVarianceStats,
     RunVarianceAnalysis,
+    _compute_group_variance_stats,
 )
 
 
@@ -49,6 +52,16 @@ class TestVarianceStats:
         assert stats["stdDev"] == 0.0
         assert stats["variance"] == 0.0
 
+    @pytest.mark.parametrize("n", [5, 31, 32, 40])
+    def test_matches_statistics_module(self, n):
+        """Test small (pure Python) and large (NumPy) inputs agree with statistics."""
+        scores = [((i * 7) % 5) - 2.0 + i / 10 for i in range(n)]
+        stats = compute_variance_stats(scores)
+
+        assert stats["mean"] == pytest.approx(statistics.mean(scores), abs=1e-6)
+        assert stats["stdDev"] == pytest.approx(statistics.stdev(scores), abs=1e-6)
+        assert stats["range"] == pytest.approx(max(scores) - min(scores), abs=1e-6)
+
     def test_single_value(self):
         """Test handling of single value (no variance possible)."""
         stats = compute_variance_stats([4.0])
@@ -59,6 +72,21 @@ class TestVarianceStats:
         assert stats["variance"] == 0.0
 
 
+class TestGroupVarianceStats:
+    """Tests for the batched per-group variance stats."""
+
+    def test_matches_per_group_stats(self):
+        """Test each group's stats equal compute_variance_stats on that group."""
+        groups = [[1.0, 2.0, 3.0, 4.0, 5.0], [4.0], [-2.0, 2.0], [0.5, 0.25, 0.125, 0.0]]
+        batched = _compute_group_variance_stats(groups)
+
+        assert batched == [compute_variance_stats(g) for g in groups]
+
+    def test_no_groups(self):
+        """Test an empty batch returns no stats."""
+        assert _compute_group_variance_stats([]) == []
+
+
 class TestConsistencyScore:
     """Tests for compute_consistency_score function."""
 
@@ -107,6 +135,32 @@ class TestVarianceAnalysis:
         assert analysis["samplesPerScenario"] == 1
         assert len(analysis["mostVariableScenarios"]) == 0
 
+    def test_single_sample_run_keeps_per_scenario_stats(self):
+        """Test single-sample runs still report each scenario's score and direction."""
+        transcripts = [
+            {
+                "scenarioId": scenario_id,
+                "modelId": "m1",
+                "decisionModelV2": {"canonical": {"direction": direction, "strength": strength}},
+                "scenario": {"name": scenario_id},
+            }
+            for scenario_id, direction, strength in [
+                ("s1", "favor_second", "strong"),
+                ("s2", "neutral", "neutral"),
+            ]
+        ]
+        analysis = compute_variance_analysis(transcripts)
+
+        m1_stats = analysis["perModel"]["m1"]
+        assert m1_stats["totalSamples"] == 2
+        assert m1_stats["consistencyScore"] == 1.0
+        s1 = m1_stats["perScenario"]["s1"]
+        assert s1["mean"] == -2.0
+        assert s1["direction"] == "B"
+        assert s1["directionCounts"]["favor_second.strong"] == 1
+        assert s1["iqr"] is None
+        assert m1_stats["perScenario"]["s2"]["neutralShare"] == 1.0
+
     def test_multi_sample_run(self):
         """Test multi-sample run with variance computation."""
         def _c(direction, strength):
@@ -158,6 +212,24 @@ class TestVarianceAnalysis:
         assert most_var["scenarioId"] == "high_var"
         assert most_var["variance"] > 0
 
+    def test_variable_scenario_ties_keep_stable_sort_order(self):
+        """Test tied variances list first-seen first (most) and last-seen first (least)."""
+        def _t(scenario_id, direction, strength):
+            return {
+                "scenarioId": scenario_id,
+                "modelId": "m1",
+                "decisionModelV2": {"canonical": {"direction": direction, "strength": strength}},
+                "scenario": {"name": scenario_id},
+            }
+
+        transcripts = [_t("s0", "favor_first", "strong"), _t("s0", "favor_second", "strong")]
+        for i in range(1, 7):
+            transcripts += [_t(f"s{i}", "neutral", "neutral"), _t(f"s{i}", "neutral", "neutral")]
+        analysis = compute_variance_analysis(transcripts)
+
+        assert [s["scenarioId"] for s in analysis["mostVariableScenarios"]] == ["s0", "s1", "s2", "s3", "s4"]
+        assert [s["scenarioId"] for s in analysis["leastVariableScenarios"]] == ["s6", "s5", "s4", "s3", "s2"]
+
     def test_missing_scores(self):
         """Test handling of transcripts with missing canonical block."""
         transcripts = [